@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import well_profile as wp
+
+
+def survey(stations, seed=0, length=10000):
+    """
+    Generate a synthetic survey with smooth random changes of inclination and azimuth
+    :param stations: number of survey stations
+    :param seed: seed for the random numbers
+    :param length: target depth, m
+    :return: dataframe with md, inc and azi columns
+    """
+    rng = np.random.default_rng(seed)
+    md = np.linspace(0, length, stations)
+    inc = np.clip(np.cumsum(rng.normal(0.3, 1, stations) * 30 / max(stations / 300, 1)), 0, 95)
+    inc[:stations // 10] = 0        # vertical section at the top
+    azi = (np.cumsum(rng.normal(0, 0.5, stations) * 30 / max(stations / 300, 1)) + rng.uniform(0, 360)) % 360
+    return pd.DataFrame({'md': md, 'inc': inc, 'azi': azi})
+
+
+def well(stations, seed=0, **kwargs):
+    """
+    Load a synthetic survey as well
+    """
+    return wp.load(survey(stations, seed), **kwargs)
+
+
+def field(wells, stations, seed=0):
+    """
+    Get synthetic wells spread around a pad
+    """
+    rng = np.random.default_rng(seed)
+    return [wp.load(survey(stations, seed + idx), set_start={'north': rng.uniform(-50, 50),
+                                                             'east': rng.uniform(-50, 50)})
+            for idx in range(wells)]
@@ -0,0 +1,170 @@
+"""
+Benchmarks for load, get, two_points, get_point and the plots, with synthetic wells (no files or network needed).
+
+    python -m benchmarks.run                      # all the benchmarks
+    python -m benchmarks.run load get_point       # only the benchmarks whose name contains any of these words
+    python -m benchmarks.run --sizes 100 1000 --repeat 5 --output bench_output.txt
+
+A benchmark returns the function to time, or a context manager giving it when it needs to clean up after the runs.
+Every benchmark reports the best time of some runs and the peak memory allocated during one more run (tracemalloc).
+"""
+from . import fixtures
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import well_profile as wp
+
+
+SIZES = [100, 1000, 10000, 100000]
+
+
+def load_dataframe(size):
+    data = fixtures.survey(size)
+    return lambda: wp.load(data)
+
+
+def load_lists(size):
+    data = fixtures.survey(size)
+    data = [data['md'].tolist(), data['inc'].tolist(), data['azi'].tolist()]
+    return lambda: wp.load(data)
+
+
+@contextlib.contextmanager
+def load_csv(size, **kwargs):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'survey.csv')
+        fixtures.survey(size).to_csv(path, index=False)
+        yield lambda: wp.load(path, **kwargs)
+
+
+def load_csv_chunks(size):
+    return load_csv(size, chunksize=10000, keep_base_data=False)
+
+
+def load_inner_points(size):
+    data = fixtures.survey(size // 10)      # 10 inner points between every pair of stations
+    return lambda: wp.load(data, inner_points=10)
+
+
+def get_j(size):
+    return lambda: wp.get(10000, profile='J', kop=1000, eob=3000, build_angle=60, points=size)
+
+
+def get_h2(size):
+    return lambda: wp.get(10000, profile='H2', kop=1000, eob=2000, kop2=3000, eob2=4000, build_angle=45,
+                          points=size)
+
+
+def two_points(size):
+    points = {'kickoff': {'north': 0, 'east': 0, 'tvd': 500}, 'target': {'north': 800, 'east': 300, 'tvd': 1500}}
+    return lambda: wp.two_points({key: value.copy() for key, value in points.items()}, inner_points=size)
+
+
+def get_point_md(size):
+    well = fixtures.well(size)
+    depths = np.random.default_rng(0).uniform(0, well.md[-1], 1000)
+    return lambda: [well.get_point(depth) for depth in depths]
+
+
+def get_point_tvd(size):
+    well = fixtures.well(size)
+    depths = np.random.default_rng(0).uniform(0, well.tvd_index[-1], 1000)
+    return lambda: [well.get_point(depth, depth_type='tvd') for depth in depths]
+
+
+def get_points_md(size):
+    well = fixtures.well(size)
+    depths = np.random.default_rng(0).uniform(0, well.md[-1], 1000)
+    return lambda: well.get_points(depths)
+
+
+def trajectory(size):
+    well = fixtures.well(size)
+
+    def run():
+        well._trajectory = None
+        return well.trajectory
+    return run
+
+
+def plot_3d(size):
+    well = fixtures.well(size)
+    return lambda: well.plot().to_json()
+
+
+def plot_3d_multiple(size):
+    wells = fixtures.field(20, size // 20)
+    return lambda: wells[0].plot(add_well=wells[1:]).to_json()
+
+
+def plot_3d_color(size):
+    well = fixtures.well(size)
+    return lambda: well.plot(style={'color': 'dls'}).to_json()
+
+
+def plot_top(size):
+    wells = fixtures.field(20, size // 20)
+    return lambda: wells[0].plot(plot_type='top', add_well=wells[1:]).to_json()
+
+
+def plot_vs(size):
+    wells = fixtures.field(20, size // 20)
+    return lambda: wells[0].plot(plot_type='vs', x_axis='md', y_axis='dls', add_well=wells[1:]).to_json()
+
+
+BENCHMARKS = [load_dataframe, load_lists, load_csv, load_csv_chunks, load_inner_points, get_j, get_h2, two_points,
+              get_point_md, get_point_tvd, get_points_md, trajectory, plot_3d, plot_3d_multiple, plot_3d_color,
+              plot_top, plot_vs]
+
+
+def measure(run, repeat=3):
+    """
+    Get the best time of some runs, s, and the peak memory allocated during one more run, MB
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return min(times), peak / 2 ** 20
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='well_profile benchmarks')
+    parser.add_argument('names', nargs='*', help='run only the benchmarks whose name contains any of these words')
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES, help='number of points of the wells')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs')
+    parser.add_argument('--output', help='also write the results to this file')
+    args = parser.parse_args(args)
+
+    lines = ['{:<20}{:>10}{:>14}{:>14}'.format('benchmark', 'size', 'time, ms', 'peak, MB')]
+    print(lines[0])
+    for benchmark in BENCHMARKS:
+        if args.names and not any(name in benchmark.__name__ for name in args.names):
+            continue
+        for size in args.sizes:
+            with contextlib.ExitStack() as stack:
+                run = benchmark(size)
+                if hasattr(run, '__enter__'):
+                    run = stack.enter_context(run)
+                seconds, peak = measure(run, args.repeat)
+            lines.append('{:<20}{:>10}{:>14.2f}{:>14.2f}'.format(benchmark.__name__, size, seconds * 1000, peak))
+            print(lines[-1], flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,7 @@
-from .create_trajectory import get
-from .load_trajectory import load
-from .generator import two_points
+from .create_trajectory import get, plan
+from .load_trajectory import load, load_many, open_well, register_alias
+from .generator import two_points, two_points_batch
+from .anticollision import closest_approach, separation
+from .field import Field
+from .profiling import profile
+from .stream import SurveyFeed, read_json_lines
@@ -0,0 +1,238 @@
+import numpy as np
+
+
+def closest_approach(reference, offset, block_size=64, tolerance=1e-6):
+    """
+    Find the closest approach between two wells. The trajectories are taken as straight segments between consecutive
+    points, the segments are grouped in blocks with a bounding box and only the pairs of blocks whose boxes are
+    closer than the best distance found so far are compared.
+
+    Parameters
+    ----------
+    reference: well object
+    offset: well object
+    block_size: int
+        number of segments per bounding box.
+    tolerance: num
+        pairs of blocks that can't reduce the distance by more than this value are not compared, m or ft.
+
+    Returns
+    -------
+    result: dict
+        'distance', 'md' (on the reference well), 'md_offset', 'point' and 'point_offset' ([north, east, tvd]).
+    """
+    ref, off = segment_blocks(reference, block_size), segment_blocks(offset, block_size)
+    lower = box_distance(ref['box_min'][:, None], ref['box_max'][:, None], off['box_min'][None], off['box_max'][None])
+
+    best, found = np.inf, None
+    for pair in np.argsort(lower, axis=None):
+        i, j = np.unravel_index(pair, lower.shape)
+        if lower[i, j] >= best - tolerance:
+            break
+        a, b = block_segments(ref, i), block_segments(off, j)
+        distance, s, t = blocks_distance(a, b)
+        k, m = np.unravel_index(np.argmin(distance), distance.shape)
+        if distance[k, m] < best:
+            best = distance[k, m]
+            found = (a, k, s[k, m], b, m, t[k, m])
+
+    a, k, s, b, m, t = found
+    return {'distance': float(best),
+            'md': float(a['md_start'][k] + s * (a['md_end'][k] - a['md_start'][k])),
+            'md_offset': float(b['md_start'][m] + t * (b['md_end'][m] - b['md_start'][m])),
+            'point': a['start'][k] + s * (a['end'][k] - a['start'][k]),
+            'point_offset': b['start'][m] + t * (b['end'][m] - b['start'][m])}
+
+
+def separation(reference, offsets, block_size=64, tolerance=1e-6):
+    """
+    Calculate the center to center distance from every point of the reference well to the offset wells.
+
+    Parameters
+    ----------
+    reference: well object
+    offsets: well object or list of well objects
+    block_size: int
+        number of segments per bounding box.
+    tolerance: num
+        blocks that can't reduce the distance by more than this value are not compared, m or ft.
+
+    Returns
+    -------
+    result: dict or list of dicts (one per offset well)
+        'md' (on the reference well), 'distance' and 'md_offset' (closest md on the offset well) arrays.
+    """
+    if not isinstance(offsets, list):
+        return separation(reference, [offsets], block_size, tolerance)[0]
+
+    points = np.column_stack((reference.north, reference.east, reference.tvd))
+    groups = np.arange(0, len(points), block_size)      # the points are also grouped in blocks with a bounding box
+    group = np.arange(len(points)) // block_size
+    group_min, group_max = np.minimum.reduceat(points, groups), np.maximum.reduceat(points, groups)
+
+    results = []
+    for offset in offsets:
+        blocks = segment_blocks(offset, block_size)
+        lower = box_distance(group_min[:, None], group_max[:, None], blocks['box_min'], blocks['box_max'])
+
+        # the block with the closest box to every group of points gives a first distance
+        distance = np.empty(len(points))
+        md_offset = np.empty(len(points))
+        nearest = np.argmin(lower, axis=1)[group]
+        for j in np.unique(nearest):
+            idx = np.flatnonzero(nearest == j)
+            distance[idx], md_offset[idx] = points_to_block(points[idx], block_segments(blocks, j))
+
+        # then only the points that can still get closer to another block
+        upper = np.maximum.reduceat(distance, groups)
+        for j in np.argsort(lower.min(axis=0)):
+            idx = np.flatnonzero((lower[:, j] < upper - tolerance)[group])
+            idx = idx[box_distance(points[idx], points[idx], blocks['box_min'][j], blocks['box_max'][j]) <
+                      distance[idx] - tolerance]
+            if len(idx) > 0:
+                block_distance, block_md = points_to_block(points[idx], block_segments(blocks, j))
+                closer = block_distance < distance[idx]
+                distance[idx[closer]] = block_distance[closer]
+                md_offset[idx[closer]] = block_md[closer]
+
+        results.append({'md': reference.md.copy(), 'distance': distance, 'md_offset': md_offset})
+
+    return results
+
+
+def segment_blocks(well, block_size=64):
+    """
+    Get the segments between consecutive points of a well and the bounding box of every block of segments
+    :param well: well object
+    :param block_size: number of segments per block
+    :return: dict with 'start' and 'end' points ([north, east, tvd]), 'md_start', 'md_end', 'box_min', 'box_max'
+        and 'block_size'
+    """
+    points = np.column_stack((well.north, well.east, well.tvd))
+    md = np.asarray(well.md)
+    if len(points) == 1:        # a single point is taken as a segment with zero length
+        points, md = np.repeat(points, 2, axis=0), np.repeat(md, 2)
+
+    start, end = points[:-1], points[1:]
+    blocks = np.arange(0, len(start), block_size)
+    return {'start': start, 'end': end, 'md_start': md[:-1], 'md_end': md[1:], 'block_size': block_size,
+            'box_min': np.minimum(np.minimum.reduceat(start, blocks), np.minimum.reduceat(end, blocks)),
+            'box_max': np.maximum(np.maximum.reduceat(start, blocks), np.maximum.reduceat(end, blocks))}
+
+
+def block_segments(blocks, idx):
+    """
+    Get the segments of a single block
+    """
+    block = slice(idx * blocks['block_size'], (idx + 1) * blocks['block_size'])
+    return {name: blocks[name][block] for name in ['start', 'end', 'md_start', 'md_end']}
+
+
+def points_to_block(points, block):
+    """
+    Get the distance from every point to its closest segment in a block, and the md where it is found. All the
+    distances are calculated with matrix products, relative to the start of the block to keep the precision.
+    """
+    origin = block['start'][0]
+    p, a = points - origin, block['start'] - origin
+    ab = block['end'] - block['start']
+    length = np.sum(ab ** 2, axis=1)
+
+    p_ab = p @ ab.T - np.sum(a * ab, axis=1)        # (p - a) . ab
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.clip(np.where(length > 0, p_ab / length, 0), 0, 1)
+    squared = np.sum(p ** 2, axis=1)[:, None] - 2 * p @ a.T + np.sum(a ** 2, axis=1) - 2 * t * p_ab + t ** 2 * length
+
+    closest = np.argmin(squared, axis=1)
+    rows = np.arange(len(points))
+    t = t[rows, closest]
+    md = block['md_start'][closest] + t * (block['md_end'][closest] - block['md_start'][closest])
+    return np.sqrt(np.maximum(squared[rows, closest], 0)), md
+
+
+def box_distance(min1, max1, min2, max2):
+    """
+    Minimum distance between axis aligned boxes, zero if they overlap
+    """
+    squared = 0
+    for axis in range(3):
+        gap = np.maximum(min2[..., axis] - max1[..., axis], min1[..., axis] - max2[..., axis])
+        np.maximum(gap, 0, out=gap)
+        squared = squared + gap * gap
+    return np.sqrt(squared)
+
+
+def point_segment_distance(p, a, b):
+    """
+    Distance from points to segments
+    :param p: points, array with shape (..., 3)
+    :param a: segment start points, array with shape (..., 3)
+    :param b: segment end points, array with shape (..., 3)
+    :return: distance and position along the segment (0 at a, 1 at b)
+    """
+    ab = b - a
+    length = np.sum(ab ** 2, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(length > 0, np.sum((p - a) * ab, axis=-1) / length, 0)
+    t = np.clip(t, 0, 1)
+    return np.linalg.norm(p - (a + t[..., None] * ab), axis=-1), t
+
+
+def segments_distance(p1, q1, p2, q2):
+    """
+    Distance between pairs of segments
+    :param p1: start points of the first segments, array with shape (..., 3)
+    :param q1: end points of the first segments, array with shape (..., 3)
+    :param p2: start points of the second segments, array with shape (..., 3)
+    :param q2: end points of the second segments, array with shape (..., 3)
+    :return: distance and position of the closest points along the first and second segments (from 0 to 1)
+    """
+    d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+    a, e = np.sum(d1 ** 2, axis=-1), np.sum(d2 ** 2, axis=-1)
+    b, c, f = np.sum(d1 * d2, axis=-1), np.sum(d1 * r, axis=-1), np.sum(d2 * r, axis=-1)
+    s, t = closest_parameters(*np.broadcast_arrays(a, b, c, e, f))
+
+    distance = np.linalg.norm((p1 + s[..., None] * d1) - (p2 + t[..., None] * d2), axis=-1)
+    return distance, s, t
+
+
+def blocks_distance(block1, block2):
+    """
+    Distance between every segment of a block and every segment of another one, same as segments_distance but the
+    dot products are calculated with matrix products, relative to the start of the first block to keep the precision
+    :return: distance and position of the closest points along the segments, arrays with shape (len1, len2)
+    """
+    origin = block1['start'][0]
+    p1, p2 = block1['start'] - origin, block2['start'] - origin
+    d1, d2 = block1['end'] - block1['start'], block2['end'] - block2['start']
+
+    a, e = np.sum(d1 ** 2, axis=1)[:, None], np.sum(d2 ** 2, axis=1)
+    b = d1 @ d2.T
+    c = np.sum(d1 * p1, axis=1)[:, None] - d1 @ p2.T        # d1 . r, with r = p1 - p2
+    f = p1 @ d2.T - np.sum(d2 * p2, axis=1)                 # d2 . r
+    a, b, c, e, f = np.broadcast_arrays(a, b, c, e, f)
+    s, t = closest_parameters(a, b, c, e, f)
+
+    r2 = np.sum(p1 ** 2, axis=1)[:, None] - 2 * p1 @ p2.T + np.sum(p2 ** 2, axis=1)
+    squared = r2 + s ** 2 * a + t ** 2 * e + 2 * s * c - 2 * t * f - 2 * s * t * b     # |r + s d1 - t d2|^2
+    return np.sqrt(np.maximum(squared, 0)), s, t
+
+
+def closest_parameters(a, b, c, e, f):
+    """
+    Position of the closest points between two segments (from 0 to 1), with a = d1.d1, b = d1.d2, c = d1.r,
+    e = d2.d2 and f = d2.r, where d1 and d2 are the segment directions and r the vector between their start points
+    """
+    denominator = a * e - b ** 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # closest point of the first segment to the line of the second one (any point if they are parallel)
+        s = np.where(denominator > 0, np.clip((b * f - c * e) / denominator, 0, 1), 0)
+        s = np.where(a > 0, np.where(e > 0, s, np.clip(-c / a, 0, 1)), 0)       # e = 0 if the second one is a point
+        # closest point of the second segment to that point, then the first segment is checked again
+        t = np.where(e > 0, (b * s + f) / e, 0)
+        s = np.where(t < 0, np.where(a > 0, np.clip(-c / a, 0, 1), 0), s)
+        s = np.where(t > 1, np.where(a > 0, np.clip((b - c) / a, 0, 1), 0), s)
+        t = np.clip(t, 0, 1)
+
+    return s, t
@@ -1,7 +1,11 @@
 from .equations import *
-from numpy import arange
-from math import degrees
-from .well import Well, define_section
+import numpy as np
+import pandas as pd
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .well import Well, define_sections, POINT_TYPES
+from .profiling import stage
 
 
 def get(mdt, profile='V', build_angle=1, kop=0, eob=0, sod=0, eod=0, kop2=0, eob2=0, **kwargs):
@@ -31,14 +35,21 @@ def get(mdt, profile='V', build_angle=1, kop=0, eob=0, sod=0, eod=0, kop2=0, eob
 
     Keyword Args
     ------------
+    step: num
+        distance between points along md, m or ft. Used by default with a value of 1.
     points: int
-        number of points
+        total number of points along md, section boundaries included, used instead of step.
+    curve_points: int
+        include only the section boundaries and this number of points inside every curved section, used instead of
+        step or points.
     set_start: dict, None
         set initial point in m {'north': 0, 'east': 0}.
     change_azimuth: float, int, None
         add specific degrees to azimuth values along the entire well.
     set_info: dict, None
         dict, {'dlsResolution', 'wellType': 'onshore'|'offshore', 'units': 'metric'|'english'}.
+    compact: bool
+        store the columns as float32, see Well.compact. Default False.
 
     Returns
     -------
@@ -47,7 +58,8 @@ def get(mdt, profile='V', build_angle=1, kop=0, eob=0, sod=0, eod=0, kop2=0, eob
     """
 
     # Settings
-    params = {'points': 100, 'set_start': None, 'change_azimuth': None, 'set_info': None, 'ndigits': 2}
+    params = {'step': 1, 'points': None, 'curve_points': None, 'set_start': None, 'change_azimuth': None,
+              'set_info': None, 'ndigits': 2, 'compact': False}
     for key, value in kwargs.items():
         params[key] = value
     set_start = params['set_start']
@@ -68,317 +80,361 @@ def get(mdt, profile='V', build_angle=1, kop=0, eob=0, sod=0, eod=0, kop2=0, eob
             if x in initial_point:
                 initial_point[x] = set_start[x]
 
-    md = list(arange(0, mdt + 1, 1))    # Measured Depth from RKB, m
-    depth_step = md[1]
-
     if profile == 'V':        # Vertical well
-        tvd, north, east, inc, az = vertical_section(profile, md, kop, depth_step)
+        knots = vertical_section(mdt)
 
     elif profile == 'J':        # J-type well
-        tvd, north, east, inc, az = create_j_well(mdt, md, kop, eob, build_angle, depth_step)
+        knots = create_j_well(mdt, kop, eob, build_angle)
 
     elif profile == 'S':  # S-type well
-        tvd, north, east, inc, az = create_s_well(mdt, md, kop, eob, sod, eod, build_angle, depth_step)
+        knots = create_s_well(mdt, kop, eob, sod, eod, build_angle)
 
     elif profile == 'H1':     # Horizontal single-curve well
-        tvd, north, east, inc, az = create_h1_well(mdt, md, kop, eob, depth_step)
+        knots = create_h1_well(mdt, kop, eob)
 
     else:        # Horizontal double-curve well
-        tvd, north, east, inc, az = create_h2_well(mdt, md, kop, eob, kop2, eob2, build_angle, depth_step)
-
-    if change_azimuth is not None:
-        az, north_new, east_new = mod_azimuth(change_azimuth, az, north, east)
-
-    # CREATING TRAJECTORY POINTS
-    trajectory = [{'md': 0, 'inc': 0, 'azi': 0, 'dl': 0, 'tvd': 0, 'sectionType': 'vertical'}]
-    trajectory[-1].update(initial_point)
-    for idx, md in enumerate(md):
-        if idx > 0:
-            dogleg = calc_dogleg(inc[idx - 1], inc[idx], az[idx - 1], az[idx])
-            point = {'md': md, 'inc': inc[idx], 'azi': az[idx],
-                     'north': calc_north(trajectory[-1]['north'], trajectory[-1]['md'], md,
-                                         trajectory[-1]['inc'], inc[idx],
-                                         trajectory[-1]['azi'], az[idx],
-                                         dogleg),
-                     'east': calc_east(trajectory[-1]['east'], trajectory[-1]['md'], md,
-                                       trajectory[-1]['inc'], inc[idx],
-                                       trajectory[-1]['azi'], az[idx],
-                                       dogleg),
-                     'tvd': calc_tvd(trajectory[-1]['tvd'], trajectory[-1]['md'], md,
-                                     trajectory[-1]['inc'], inc[idx], dogleg),
-                     'dl': degrees(dogleg)
-                     }
-            point['sectionType'] = define_section(point, trajectory[-1])
-            trajectory.append(point)
-
-    return Well({'trajectory': trajectory, 'info': info})
-
-
-def vertical_section(profile, md, kop, depth_step):
+        knots = create_h2_well(mdt, kop, eob, kop2, eob2, build_angle)
+
+    with stage('get', 'md') as done:
+        md = profile_md(*knots, step=params['step'], points=params['points'],
+                        curve_points=params['curve_points'])     # Measured Depth from RKB, m
+        done(md)
+
+    with stage('get', 'stations') as done:
+        azimuth = change_azimuth if change_azimuth is not None else 0
+        columns = calc_profile(md, *knots, azimuth=azimuth, north=initial_point['north'],
+                               east=initial_point['east'])
+        done(columns)
+
+    with stage('get', 'well') as done:
+        well = Well({'columns': columns, 'info': info})
+        if params['compact']:
+            well.compact()
+        done(columns)
+
+    return well
+
+
+def plan(profile, ranges, target=None, max_dls=None, tolerance=None, top=None, workers=None, batch_size=100000,
+         wells=0, **kwargs):
+    """
+    Evaluate every combination of parameters of a profile and rank them. Only the summary of every wellpath is
+    calculated (in closed form, from the section boundaries), the combinations are evaluated in batches spread across
+    a pool of processes.
+
+    Parameters
+    ----------
+    profile: str
+        'V', 'J', 'S', 'H1' or 'H2', as in get.
+    ranges: dict
+        values to try for every parameter of get: 'mdt', 'kop', 'eob', 'sod', 'eod', 'kop2', 'eob2' and
+        'build_angle'. Every value can be a number or a list/array of numbers. 'mdt' is needed.
+    target: dict, None
+        {'tvd': num, 'displacement': num}, tvd and horizontal displacement to reach at target depth (either one can
+        be left out). The combinations are ranked by their distance to the target.
+    max_dls: num, None
+        discard the combinations with a higher dls, °/dlsResolution.
+    tolerance: num, None
+        discard the combinations farther than this distance from the target, m or ft.
+    top: int, None
+        keep only this number of combinations, the best ones. Every batch keeps only its best ones too, so large
+        sweeps use little memory.
+    workers: int, None
+        number of processes. By default the number of CPUs, with 1 the batches are evaluated in this process.
+    batch_size: int
+        number of combinations per batch.
+    wells: int
+        number of combinations, from the top of the ranking, to also build as well objects.
+
+    Keyword Args
+    ------------
+        step, points, curve_points, set_start, change_azimuth and set_info for the wells built, as in get.
+        set_info['dlsResolution'] is also used for max_dls.
+
+    Returns
+    -------
+    table: dataframe
+        a row per valid combination sorted from the best: the parameters, 'tvd' and 'displacement' at target depth,
+        'max_inc', 'max_dls' and 'error' (distance to the target, 0 without target). With wells > 0, a 'well' column
+        has the well objects of the first rows.
+    """
+    settings = {'profile': profile, 'ranges': {x: np.atleast_1d(np.asarray(values, dtype=float))
+                                               for x, values in ranges.items()},
+                'target': target, 'max_dls': max_dls, 'tolerance': tolerance, 'top': top,
+                'dls_resolution': (kwargs.get('set_info') or {}).get('dlsResolution', 30)}
+    total = int(np.prod([len(values) for values in settings['ranges'].values()]))
+    batches = [(first, min(first + batch_size, total)) for first in range(0, total, batch_size)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(batches) <= 1:
+        results = [evaluate_batch(settings, batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(evaluate_batch, itertools.repeat(settings), batches))
+
+    table = pd.concat(results, ignore_index=True) if results else evaluate_batch(settings, (0, 0))
+    table = rank(table, top)
+
+    if wells > 0:
+        table['well'] = None
+        for idx in range(min(wells, len(table))):
+            params = {x: table.at[idx, x] for x in ranges if x != 'mdt'}
+            table.at[idx, 'well'] = get(table.at[idx, 'mdt'], profile=profile, **params, **kwargs)
+
+    return table
+
+
+def evaluate_batch(settings, batch):
+    """
+    Evaluate a range of the combinations of parameters of plan
+    :param settings: dict with profile, ranges, target, max_dls, tolerance, top and dls_resolution
+    :param batch: first and last + 1 position of the combinations, in the order of itertools.product
+    :return: dataframe with the parameters and the summary of the valid combinations that meet the limits
+    """
+    names = list(settings['ranges'])
+    shape = [len(values) for values in settings['ranges'].values()]
+    positions = np.unravel_index(np.arange(*batch), shape)
+    params = {x: settings['ranges'][x][idx] for x, idx in zip(names, positions)}
+
+    table = pd.DataFrame(summarize_profiles(settings['profile'], params, settings['dls_resolution']))
+    table = table[table['valid']].drop(columns='valid')
+
+    error = np.zeros(len(table))
+    for key in ['tvd', 'displacement']:
+        if settings['target'] is not None and key in settings['target']:
+            error += (table[key].values - settings['target'][key]) ** 2
+    table['error'] = error ** 0.5
+
+    if settings['max_dls'] is not None:
+        table = table[table['max_dls'] <= settings['max_dls']]
+    if settings['tolerance'] is not None:
+        table = table[table['error'] <= settings['tolerance']]
+    return rank(table, settings['top'])
+
+
+def rank(table, top=None):
+    """
+    Sort the combinations from the closest to the target, then from the lowest dls
+    """
+    table = table.sort_values(['error', 'max_dls'], kind='stable')
+    if top is not None:
+        table = table.iloc[:top]
+    return table.reset_index(drop=True)
+
+
+def summarize_profiles(profile, params, dls_resolution=30):
+    """
+    Calculate the summary of many wellpaths of the same profile at once, in closed form
+    :param profile: 'V', 'J', 'S', 'H1' or 'H2'
+    :param params: dict of arrays, mdt and the parameters of the profile as in get (others are ignored)
+    :param dls_resolution: depth window used for dls
+    :return: dict of arrays with the parameters, tvd and displacement at target depth, max_inc, max_dls and valid
+        (False where the section boundaries are not sorted)
+    """
+    knots_md, knots_inc = profile_knots(profile, params)
+    knots_inc = np.radians(knots_inc)
+    mdt = np.asarray(params['mdt'], dtype=float)[:, None]
+
+    # sections cut at target depth
+    start_inc = knots_inc[:, :-1]
+    full_length, change = np.diff(knots_md, axis=1), np.diff(knots_inc, axis=1)
+    length = np.minimum(knots_md[:, 1:], mdt) - np.minimum(knots_md[:, :-1], mdt)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        build_rate = np.where(full_length > 0, change / full_length, 0)
+        end_inc = start_inc + build_rate * length
+        radius = 1 / build_rate
+        curved = build_rate != 0
+        horizontal = np.where(curved, radius * (np.cos(start_inc) - np.cos(end_inc)), length * np.sin(start_inc))
+        vertical = np.where(curved, radius * (np.sin(end_inc) - np.sin(start_inc)), length * np.cos(start_inc))
+
+    used = length > 0
+    valid = np.all(full_length >= 0, axis=1) & np.all((full_length > 0) | (change == 0), axis=1) & (mdt[:, 0] > 0)
+    summary = {x: np.asarray(values, dtype=float) for x, values in params.items()}
+    summary.update({'tvd': vertical.sum(axis=1), 'displacement': horizontal.sum(axis=1),
+                    'max_inc': np.degrees(np.max(np.where(used, np.maximum(start_inc, end_inc), 0), axis=1)),
+                    'max_dls': np.degrees(np.max(np.where(used, np.abs(build_rate), 0), axis=1)) * dls_resolution,
+                    'valid': valid})
+    return summary
+
+
+def profile_knots(profile, params):
+    """
+    Get the section boundaries of many wellpaths of the same profile, also used by create_*_well for a single one
+    :param profile: 'V', 'J', 'S', 'H1' or 'H2'
+    :param params: dict of arrays, mdt and the parameters of the profile as in get (others are ignored)
+    :return: md and inclination at every boundary, 2D arrays with a row per wellpath
+    """
+    defaults = {'build_angle': 1, 'kop': 0, 'eob': 0, 'sod': 0, 'eod': 0, 'kop2': 0, 'eob2': 0}
+    size = len(params['mdt'])
+    values = {x: np.broadcast_to(np.asarray(params.get(x, default), dtype=float), (size,))
+              for x, default in dict(defaults, mdt=None).items()}
+    zero, right = np.zeros(size), np.full(size, 90.)
+    mdt, kop, eob, angle = values['mdt'], values['kop'], values['eob'], values['build_angle']
+
     if profile == 'V':
-        tvd = md
+        knots = [(zero, zero), (mdt, zero)]
+    elif profile == 'J':
+        knots = [(zero, zero), (kop, zero), (eob, angle), (np.maximum(eob, mdt), angle)]
+    elif profile == 'S':
+        knots = [(zero, zero), (kop, zero), (eob, angle), (values['sod'], angle), (values['eod'], zero),
+                 (np.maximum(values['eod'], mdt), zero)]
+    elif profile == 'H1':
+        knots = [(zero, zero), (kop, zero), (eob, right), (np.maximum(eob, mdt), right)]
+    else:
+        knots = [(zero, zero), (kop, zero), (eob, angle), (values['kop2'], angle), (values['eob2'], right),
+                 (np.maximum(values['eob2'], mdt), right)]
+
+    return np.column_stack([md for md, _ in knots]), np.column_stack([inc for _, inc in knots])
+
+
+def calc_profile(md, knots_md, knots_inc, azimuth=0, north=0, east=0):
+    """
+    Calculate a wellpath made of straight and constant curvature sections, in closed form.
+
+    Parameters
+    ----------
+    md: array
+        measured depths to include.
+    knots_md: array
+        measured depths of the section boundaries, from 0 to target depth.
+    knots_inc: array
+        inclination at every section boundary, changing linearly with md along each section.
+    azimuth: num
+        azimuth along the entire well.
+    north: num
+        north coordinate at surface.
+    east: num
+        east coordinate at surface.
+
+    Returns
+    -------
+    columns: dict
+        md, inc, azi, north, east, tvd, dl, sectionType and pointType arrays.
+    """
+    md = np.asarray(md, dtype=float)
+    knots_md, knots_inc = np.asarray(knots_md, dtype=float), np.radians(knots_inc)
+    section = np.clip(np.searchsorted(knots_md, md, side='right') - 1, 0, len(knots_md) - 2)
+
+    start_md, start_inc = knots_md[:-1], knots_inc[:-1]
+    length, change = np.diff(knots_md), np.diff(knots_inc)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        build_rate = np.where(length > 0, change / length, 0)
+
+    def displacement(section, section_md):
+        """horizontal and vertical displacement along the sections, from their start"""
+        inc = start_inc[section] + build_rate[section] * section_md
+        with np.errstate(divide='ignore', invalid='ignore'):
+            radius = 1 / build_rate[section]
+            curved = build_rate[section] != 0
+            horizontal = np.where(curved, radius * (np.cos(start_inc[section]) - np.cos(inc)),
+                                  section_md * np.sin(start_inc[section]))
+            vertical = np.where(curved, radius * (np.sin(inc) - np.sin(start_inc[section])),
+                                section_md * np.cos(start_inc[section]))
+        return inc, horizontal, vertical
+
+    sections = np.arange(len(length))
+    _, section_h, section_v = displacement(sections, length)
+    start_h = np.concatenate(([0], np.cumsum(section_h)[:-1]))
+    start_v = np.concatenate(([0], np.cumsum(section_v)[:-1]))
+
+    inc, horizontal, vertical = displacement(section, md - start_md[section])
+    horizontal += start_h[section]
+    tvd = vertical + start_v[section]
+    inc = np.degrees(inc)
+    azi = np.full(len(md), float(azimuth))
+
+    dl = np.degrees(np.concatenate(([0], calc_dogleg_array(inc[:-1], inc[1:], azi[:-1], azi[1:]))))
+    point_type = np.where(np.isin(md, knots_md), POINT_TYPES.index('survey'), POINT_TYPES.index('interpolated'))
+
+    return {'md': md, 'inc': inc, 'azi': azi,
+            'north': north + horizontal * np.cos(np.radians(azimuth)),
+            'east': east + horizontal * np.sin(np.radians(azimuth)),
+            'tvd': tvd, 'dl': dl, 'sectionType': define_sections(inc, tvd), 'pointType': point_type}
+
+
+def profile_md(knots_md, knots_inc, step=1, points=None, curve_points=None):
+    """
+    Get the measured depths to include in a profile. Section boundaries are always included, so the geometry is
+    exact at KOP, EOB, SOD, EOD...
+
+    Parameters
+    ----------
+    knots_md: array
+        measured depths of the section boundaries, from 0 to target depth.
+    knots_inc: array
+        inclination at every section boundary.
+    step: num
+        distance between points.
+    points: int, None
+        total number of points, used instead of step. The ones left after the section boundaries are spread over the
+        sections by their length.
+    curve_points: int, None
+        number of points inside every curved section, used instead of step or points. Straight sections only get
+        their boundaries.
+
+    Returns
+    -------
+    md: array
+        sorted measured depths.
+    """
+    mdt = knots_md[-1]
+    if curve_points is not None:
+        curved = np.flatnonzero(np.diff(knots_inc) != 0)
+        md = [np.linspace(knots_md[x], knots_md[x + 1], curve_points + 2) for x in curved]
+        md = np.concatenate([knots_md] + md)
+    elif points is not None:
+        knots_md = np.unique(knots_md)
+        length = np.diff(knots_md)
+        inner = max(points - len(knots_md), 0) * length / mdt if mdt > 0 else np.zeros(len(length))
+        count = np.floor(inner).astype(int)
+        left = int(round(inner.sum())) - count.sum()
+        count[np.argsort(count - inner)[:left]] += 1       # largest remainders first
+        md = [np.linspace(knots_md[x], knots_md[x + 1], count[x] + 2)[1:-1] for x in range(len(length))]
+        md = np.concatenate([knots_md] + md)
     else:
-        tvd = md[:round(kop / depth_step) + 1]  # True Vertical Depth from RKB, m
-
-    north = [0] * len(tvd)  # x axis
-    east = [0] * len(tvd)  # x axis
-    inclination = [0.0] * len(tvd)
-    azimuth = [0] * len(tvd)
-
-    return tvd, north, east, inclination, azimuth
-
-
-def create_s_well(mdt, md, kop, eob, sod, eod, build_angle, depth_step):
-    # Vertical section
-    tvd, north, east, inclination, azimuth = vertical_section('S', md, kop, depth_step)
-
-    # Build section
-    s = depth_step
-    theta_delta = radians(build_angle) / round((eob - kop) / depth_step)
-    theta = theta_delta
-    r = s / theta
-
-    z_displacement = (r * sin(theta))
-    tvd.append(round(tvd[-1] + z_displacement, 2))
-    z_count = z_displacement
-
-    hz_displacement = r * (1 - cos(theta))
-    north.append(round(north[-1] + hz_displacement, 2))
-    east.append(0)
-    inclination.append(degrees(theta))
-    azimuth.append(0)
-
-    for x in range(round((eob - kop) / depth_step) - 1):
-        theta += theta_delta
-        inclination.append(degrees(theta))
-        z_displacement = (r * sin(theta)) - z_count
-        tvd.append(round(tvd[-1] + z_displacement, 2))
-        z_count += z_displacement
-
-        hz_displacement = r * (1 - cos(theta)) - north[-1]
-        north.append(round(north[-1] + hz_displacement, 2))
-        east.append(0)
-        azimuth.append(0)
-
-    # Tangent section
-    z_displacement = (depth_step * cos(radians(build_angle)))
-    hz_displacement = (depth_step * sin(radians(build_angle)))
-
-    for x in range(round((sod - eob) / depth_step)):
-        tvd.append(round(tvd[-1] + z_displacement, 2))
-        north.append(round(north[-1] + hz_displacement, 2))
-        east.append(0)
-        inclination.append(inclination[-1])
-        azimuth.append(0)
-
-    # Drop section
-    s = depth_step
-    points_drop = round((eod - sod) / depth_step)
-    theta_delta = radians(build_angle) / points_drop
-    theta = radians(build_angle)
-    r = s / theta_delta
-    z_checkpoint = tvd[-1]
-    hz_checkpoint = north[-1]
-    for x in range(points_drop):
-        z_displacement = r * (sin(theta) - sin(theta - (theta_delta * (x + 1))))
-        tvd.append(round(z_checkpoint + z_displacement, 2))
-
-        hz_displacement = r * (1 - cos(theta)) - r * (1 - cos(theta - (theta_delta * (x + 1))))
-        north.append(round(hz_checkpoint + hz_displacement, 2))
-        east.append(0)
-        inclination.append(inclination[-1] - degrees(theta_delta))
-        azimuth.append(0)
-
-    # Vertical section
-    for x in range(round((mdt - eod) / depth_step)):
-        tvd.append(round(tvd[-1] + depth_step, 2))
-        north.append(north[-1])  # x axis
-        east.append(0)
-        inclination.append(0)
-        azimuth.append(0)
-
-    return tvd, north, east, inclination, azimuth
-
-
-def create_j_well(mdt, md, kop, eob, build_angle, depth_step):
-    # Vertical section
-    tvd, north, east, inclination, azimuth = vertical_section('J', md, kop, depth_step)
-
-    # Build section
-    s = depth_step
-    theta_delta = radians(build_angle / round((eob - kop) / depth_step))
-    theta = theta_delta
-    r = s / theta
-
-    z_vertical = tvd[-1]
-    z_displacement = (r * sin(theta))
-    tvd.append(round(tvd[-1] + z_displacement, 2))
-
-    hz_displacement = r * (1 - cos(theta))
-    north.append(round(north[-1] + hz_displacement, 2))
-    east.append(0)
-    inclination.append(degrees(theta))
-    azimuth.append(0)
-
-    for x in range(round((eob - kop) / depth_step) - 1):
-        theta += theta_delta
-        inclination.append(degrees(theta))
-
-        z_displacement = (r * sin(theta))
-        tvd.append(round(z_vertical + z_displacement, 2))
-
-        hz_displacement = r * (1 - cos(theta)) - north[-1]
-        north.append(round(north[-1] + hz_displacement, 2))
-        east.append(0)
-        azimuth.append(0)
-
-    # Tangent section
-    z_displacement = (depth_step * cos(radians(build_angle)))
-    hz_displacement = (depth_step * sin(radians(build_angle)))
-    for x in range(round((mdt - eob) / depth_step)):
-        tvd.append(round(tvd[-1] + z_displacement, 2))
-        north.append(round(north[-1] + hz_displacement, 2))
-        east.append(0)
-        inclination.append(inclination[-1])
-        azimuth.append(0)
-
-    return tvd, north, east, inclination, azimuth
-
-
-def create_h1_well(mdt, md, kop, eob, depth_step):
-    # Vertical section
-    tvd, north, east, inclination, azimuth = vertical_section('H1', md, kop, depth_step)
-
-    # Build section
-    s = depth_step
-    theta_delta = radians(90) / round((eob - kop) / depth_step)
-    theta = theta_delta
-    r = s / theta
-
-    z_displacement = (r * sin(theta))
-    tvd.append(round(tvd[-1] + z_displacement, 2))
-    z_count = z_displacement
-
-    hz_displacement = r * (1 - cos(theta))
-    north.append(round(north[-1] + hz_displacement, 2))
-    east.append(0)
-    inclination.append(degrees(theta))
-    azimuth.append(0)
-
-    for x in range(round((eob - kop) / depth_step) - 1):
-        theta += theta_delta
-        z_displacement = (r * sin(theta)) - z_count
-        tvd.append(round(tvd[-1] + z_displacement, 2))
-        z_count += z_displacement
-
-        hz_displacement = r * (1 - cos(theta)) - north[-1]
-        inclination.append(degrees(theta))
-        north.append(round(north[-1] + hz_displacement, 2))
-        east.append(0)
-        azimuth.append(0)
-
-    # Horizontal section
-    for x in range(round((mdt - eob) / depth_step)):
-        tvd.append(tvd[-1])
-        north.append(north[-1] + depth_step)
-        east.append(0)
-        inclination.append(90)
-        azimuth.append(0)
-
-    return tvd, north, east, inclination, azimuth
-
-
-def create_h2_well(mdt, md, kop, eob, kop2, eob2, build_angle, depth_step):
-    # Vertical section
-    tvd, north, east, inclination, azimuth = vertical_section('H2', md, kop, depth_step)
-
-    # Build section
-    s = depth_step
-    theta_delta = radians(build_angle / round((eob - kop) / depth_step))
-    theta = theta_delta
-    r = s / theta
-
-    z_displacement = (r * sin(theta))
-    tvd.append(round(tvd[-1] + z_displacement, 2))
-    z_count = z_displacement
-
-    hz_displacement = r * (1 - cos(theta))
-    north.append(round(north[-1] + hz_displacement, 2))
-    east.append(0)
-    inclination.append(degrees(theta))
-    azimuth.append(0)
-
-    for x in range(round((eob - kop) / depth_step) - 1):
-        theta = theta + theta_delta
-        z_displacement = (r * sin(theta)) - z_count
-        tvd.append(round(tvd[-1] + z_displacement, 2))
-        z_count += z_displacement
-
-        hz_displacement = r * (1 - cos(theta)) - north[-1]
-        inclination.append(degrees(theta))
-        north.append(round(north[-1] + hz_displacement, 2))
-        east.append(0)
-        azimuth.append(0)
-
-    # Tangent section
-    z_displacement = (depth_step * cos(radians(build_angle)))
-    hz_displacement = (depth_step * sin(radians(build_angle)))
-    for x in range(round((kop2 - eob) / depth_step)):
-        tvd.append(round(tvd[-1] + z_displacement, 2))
-        inclination.append(inclination[-1])
-        north.append(round(north[-1] + hz_displacement, 2))
-        east.append(0)
-        azimuth.append(0)
-
-    # Build section 2
-    s = depth_step
-    build_angle = 90 - build_angle
-    points_drop = round((eob2 - kop2) / depth_step)
-    theta_delta = radians(build_angle) / points_drop
-    theta = radians(build_angle)
-    r = s / theta_delta
-    z_checkpoint = tvd[-1]
-    hz_checkpoint = north[-1]
-
-    for x in range(points_drop):
-        hz_displacement = r * (sin(theta) - sin(theta - (theta_delta * (x + 1))))
-        north.append(round(hz_checkpoint + hz_displacement, 2))
-        inclination.append(inclination[-1] + degrees(theta_delta))
-        east.append(0)
-        azimuth.append(0)
-
-        z_displacement = r * (1 - cos(theta)) - r * (1 - cos(theta - (theta_delta * (x + 1))))
-        tvd.append(round(z_checkpoint + z_displacement, 2))
-
-    # Horizontal section
-    for x in range(round((mdt - eob2) / depth_step)):
-        tvd.append(tvd[-1])
-        north.append(north[-1] + depth_step)
-        inclination.append(inclination[-1])
-        east.append(0)
-        azimuth.append(0)
-
-    return tvd, north, east, inclination, azimuth
-
-
-def mod_azimuth(change_azimuth, azimuth_new, north_new, east_new):
-    for a in range(len(azimuth_new)):
-        azimuth_new[a] += change_azimuth
-
-        if change_azimuth <= 90:
-            east_new[a] = north_new[a] * sin(radians(change_azimuth))
-            north_new[a] *= cos(radians(change_azimuth))
-        elif 90 < change_azimuth <= 180:
-            angle = change_azimuth - 90
-            east_new[a] = north_new[a] * round(cos(radians(angle)), 3)
-            north_new[a] *= - sin(radians(angle))
-        elif 180 < change_azimuth <= 270:
-            angle = change_azimuth - 180
-            east_new[a] = - north_new[a] * round(sin(radians(angle)), 3)
-            north_new[a] *= - cos(radians(angle))
-        else:
-            angle = change_azimuth - 270
-            east_new[a] = - north_new[a] * round(cos(radians(angle)), 3)
-            north_new[a] *= sin(radians(angle))
-
-    return azimuth_new, north_new, east_new
+        md = np.arange(0, mdt + step, step)
+        md = md[md <= mdt]
+
+    return np.union1d(md, knots_md)
+
+
+def section_knots(mdt, knots_md, knots_inc):
+    """
+    Cut the section boundaries at target depth
+    """
+    knots_md, knots_inc = np.asarray(knots_md, dtype=float), np.asarray(knots_inc, dtype=float)
+    inside = knots_md < mdt
+    return (np.append(knots_md[inside], mdt),
+            np.append(knots_inc[inside], np.interp(mdt, knots_md, knots_inc)))
+
+
+def well_knots(profile, mdt, **params):
+    """
+    Get the section boundaries of one wellpath, cut at mdt
+    :param profile: 'V', 'J', 'S', 'H1' or 'H2'
+    :param mdt: target depth, m
+    :param params: parameters of the profile as in get
+    :return: md and inclination at every boundary
+    """
+    knots_md, knots_inc = profile_knots(profile, dict({x: [value] for x, value in params.items()}, mdt=[mdt]))
+    return section_knots(mdt, knots_md[0], knots_inc[0])
+
+
+def vertical_section(mdt):
+    return well_knots('V', mdt)
+
+
+def create_s_well(mdt, kop, eob, sod, eod, build_angle):
+    return well_knots('S', mdt, kop=kop, eob=eob, sod=sod, eod=eod, build_angle=build_angle)
+
+
+def create_j_well(mdt, kop, eob, build_angle):
+    return well_knots('J', mdt, kop=kop, eob=eob, build_angle=build_angle)
+
+
+def create_h1_well(mdt, kop, eob):
+    return well_knots('H1', mdt, kop=kop, eob=eob)
+
+
+def create_h2_well(mdt, kop, eob, kop2, eob2, build_angle):
+    return well_knots('H2', mdt, kop=kop, eob=eob, kop2=kop2, eob2=eob2, build_angle=build_angle)
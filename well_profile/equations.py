@@ -1,5 +1,6 @@
 from math import *
 from numpy import pi
+import numpy as np
 
 
 def calc_dogleg(inc1, inc2, azi1, azi2):
@@ -114,6 +115,68 @@ def calc_dls(point, delta_md, resolution=30):
     return point['dl'] * resolution / delta_md
 
 
+def calc_dogleg_array(inc1, inc2, azi1, azi2):
+    """
+    Calculate doglegs between pairs of points, vectorized version of calc_dogleg
+    :param inc1: inclinations at points 1
+    :param inc2: inclinations at points 2
+    :param azi1: azimuths at points 1
+    :param azi2: azimuths at points 2
+    :return: array of doglegs in radians
+    """
+    inc1, inc2, azi1, azi2 = (np.asarray(x, dtype=float) for x in (inc1, inc2, azi1, azi2))
+    inner_value = np.cos(np.radians(inc1)) * np.cos(np.radians(inc2)) + np.sin(np.radians(inc1)) * \
+        np.sin(np.radians(inc2)) * np.cos(np.radians(azi2 - azi1))
+    dl = np.arccos(np.clip(inner_value, -1, 1))
+    dl[(inc1 == inc2) & (azi1 == azi2)] = 0
+
+    return dl
+
+
+def calc_rf_array(dogleg):
+    """
+    Calculate RF for minimum curvature method, vectorized version of calc_rf
+    :param dogleg: array of doglegs between previous and current points
+    :return: array of RF
+    """
+    dogleg = np.asarray(dogleg, dtype=float)
+    rf = np.ones_like(dogleg)
+    curved = dogleg != 0
+    rf[curved] = np.tan(dogleg[curved] / 2) / (dogleg[curved] / 2)
+
+    return rf
+
+
+def min_curve(md, inc, azi, north=0, east=0, tvd=0):
+    """
+    Calculate the 3D position of all the survey stations at once using the minimum curvature method.
+    The first station is taken as tie-in point.
+    :param md: measured depths
+    :param inc: inclinations
+    :param azi: azimuths
+    :param north: north coordinate at first station
+    :param east: east coordinate at first station
+    :param tvd: tvd at first station
+    :return: dict with arrays 'dl' (dogleg with previous station in degrees), 'north', 'east' and 'tvd'
+    """
+    md, inc, azi = (np.asarray(x, dtype=float) for x in (md, inc, azi))
+
+    dogleg = calc_dogleg_array(inc[:-1], inc[1:], azi[:-1], azi[1:])
+    rf = calc_rf_array(dogleg)
+    delta_md = md[1:] - md[:-1]
+    sin_inc, cos_inc = np.sin(np.radians(inc)), np.cos(np.radians(inc))
+    sin_azi, cos_azi = np.sin(np.radians(azi)), np.cos(np.radians(azi))
+
+    north_delta = 0.5 * delta_md * (sin_inc[:-1] * cos_azi[:-1] + sin_inc[1:] * cos_azi[1:]) * rf
+    east_delta = 0.5 * delta_md * (sin_inc[:-1] * sin_azi[:-1] + sin_inc[1:] * sin_azi[1:]) * rf
+    tvd_delta = 0.5 * delta_md * (cos_inc[:-1] + cos_inc[1:]) * rf
+
+    return {'dl': np.degrees(np.concatenate(([0.0], dogleg))),
+            'north': np.cumsum(np.concatenate(([north], north_delta))),
+            'east': np.cumsum(np.concatenate(([east], east_delta))),
+            'tvd': np.cumsum(np.concatenate(([tvd], tvd_delta)))}
+
+
 def interp_pt(md, trajectory):
     """
     Get an interpolated point along a trajectory, using MD as input.
@@ -127,17 +190,39 @@ def interp_pt(md, trajectory):
     if md > trajectory[-1]['md']:
         raise ValueError("MD can't be deeper than deepest trajectory MD")
 
-    # Need to find the correct points p1 and p2 to do the interpolation
-    p1 = None
-    p2 = None
-    for idx, point in enumerate(trajectory):
-        if point['md'] < md < trajectory[idx+1]['md']:
-            p1 = point
-            p2 = trajectory[idx+1]
-            break
-        elif point['md'] == md:
-            return point
+    idx = find_md(md, trajectory)
+    if trajectory[idx]['md'] == md:
+        return trajectory[idx]
+
+    return interp_segment(md, trajectory[idx - 1], trajectory[idx])
+
 
+def find_md(md, trajectory):
+    """
+    Binary search along a trajectory sorted by MD.
+    :param md: measured depth
+    :param trajectory: list of survey points
+    :return: index of the first point with MD equal or deeper than md
+    """
+    low, high = 0, len(trajectory)
+    while low < high:
+        mid = (low + high) // 2
+        if trajectory[mid]['md'] < md:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+def interp_segment(md, p1, p2, dls_resolution=30):
+    """
+    Get an interpolated point between two consecutive trajectory points.
+    :param md: measured depth, between p1 and p2
+    :param p1: upper point
+    :param p2: lower point
+    :param dls_resolution: depth window used for dls
+    :return: an interpolated point as dict with the relevant info
+    """
     dl = (md - p1['md']) * p2['dl'] / (p2['md'] - p1['md'])
     target = {'md': md, 'dl': dl}
 
@@ -147,42 +232,106 @@ def interp_pt(md, trajectory):
     if p2['sectionType'] == 'vertical':
         return interp_vertical(target, md, p1)
 
-    return inner_pt_calcs(target, p1, p2)
+    return inner_pt_calcs(target, p1, p2, dls_resolution=dls_resolution)
 
 
-def scan_tvd(tvd, trajectory):
+def scan_tvd(tvd, trajectory, tvd_index=None, dls_resolution=30):
+    """
+    Get an interpolated point along a trajectory, using TVD as input. The first point reaching the TVD is returned.
+    :param tvd: true vertical depth
+    :param trajectory: list of survey points
+    :param tvd_index: running maximum of the trajectory TVD (see get_tvd_index), calculated if not given
+    :param dls_resolution: depth window used for dls
+    :return: an interpolated point as dict with the relevant info
+    """
+    if tvd_index is None:
+        tvd_index = get_tvd_index([p['tvd'] for p in trajectory])
+
     if tvd < 0:
         raise ValueError('TVD value must be positive')
-    if tvd > max([p['tvd'] for p in trajectory]):
+    if tvd > tvd_index[-1]:
         raise ValueError("TVD value can't be deeper than deepest trajectory TVD")
 
-    p1 = None
-    p2 = None
-    for idx, point in enumerate(trajectory):
-        if point['tvd'] < tvd:
-            if idx < len(trajectory) - 1 and round(tvd, 2) < round(trajectory[idx + 1]['tvd'], 2):
-                p1 = point
-                p2 = trajectory[idx + 1]
-                break
-        elif round(point['tvd'], 2) == round(tvd, 2):
-            return point
+    idx = int(np.searchsorted(tvd_index, tvd))
+    if round(trajectory[idx]['tvd'], 2) == round(tvd, 2):
+        return trajectory[idx]
 
-    if p2['sectionType'] == 'vertical':
-        # it means that detlaTVD == deltaMD
-        return interp_pt(p1['md'] + tvd - p1['tvd'], trajectory)
-
-    # Applying Bisection
-    new_point = interp_pt((p1['md'] + p2['md'])/2, trajectory)
-    a = p1['md']
-    b = p2['md']
-    while round(tvd, 2) != round(new_point['tvd'], 2):
-        new_md = (a + b) / 2
-        new_point = interp_pt(new_md, trajectory)
-        if new_point['tvd'] < tvd:
-            a = new_md
-        else:
-            b = new_md
-    return new_point
+    return interp_segment_tvd(tvd, trajectory[idx - 1], trajectory[idx], dls_resolution)
+
+
+def interp_segment_tvd(tvd, p1, p2, dls_resolution=30):
+    """
+    Get an interpolated point between two consecutive trajectory points, using TVD as input.
+    :param tvd: true vertical depth, p1['tvd'] < tvd <= p2['tvd']
+    :param p1: upper point
+    :param p2: lower point
+    :param dls_resolution: depth window used for dls
+    :return: an interpolated point as dict with the relevant info
+    """
+    keys = ['md', 'inc', 'azi', 'north', 'east', 'tvd', 'dl']
+    p1_array = {key: np.array([p1[key]], dtype=float) for key in keys}
+    p2_array = {key: np.array([p2[key]], dtype=float) for key in keys}
+    p2_array['sectionType'] = np.array([p2['sectionType']], dtype=object)
+    md = solve_md(np.array([tvd]), p1_array, p2_array, dls_resolution)[0]
+
+    return interp_segment(md, p1, p2, dls_resolution)
+
+
+def get_tvd_index(tvd):
+    """
+    Get the running maximum of the TVD along a trajectory. It is sorted, so the first point reaching certain TVD can
+    be found by a binary search, also when the trajectory goes up or keeps the same TVD in some sections.
+    :param tvd: list or array with the TVD of every point
+    :return: array with the deepest TVD reached until every point
+    """
+    return np.maximum.accumulate(np.asarray(tvd, dtype=float))
+
+
+def solve_md(tvd, p1, p2, dls_resolution=30, tol=1e-6, max_iter=50):
+    """
+    Find the MD where the trajectory reaches certain TVD between two consecutive points, for many points at once.
+    Vertical and hold sections are solved directly, curved sections by the Illinois method (regula falsi), which
+    keeps the solution inside the segment.
+    :param tvd: array of true vertical depths, with p1['tvd'] < tvd <= p2['tvd']
+    :param p1: dict with arrays md, inc, azi, north, east, tvd and dl at the upper points
+    :param p2: dict with arrays md, inc, azi, north, east, tvd, dl and sectionType at the lower points
+    :param dls_resolution: depth window used for dls
+    :param tol: TVD tolerance
+    :param max_iter: maximum number of iterations
+    :return: array of measured depths
+    """
+    tvd = np.asarray(tvd, dtype=float)
+
+    # hold and vertical sections, TVD changes linearly with MD
+    md = p1['md'] + (tvd - p1['tvd']) * (p2['md'] - p1['md']) / (p2['tvd'] - p1['tvd'])
+    vertical = p2['sectionType'] == 'vertical'
+    md[vertical] = (p1['md'] + tvd - p1['tvd'])[vertical]
+
+    # curved sections
+    curved = np.flatnonzero((p2['sectionType'] != 'vertical') & (p2['sectionType'] != 'hold'))
+    a, fa = p1['md'][curved], p1['tvd'][curved] - tvd[curved]
+    b, fb = p2['md'][curved], p2['tvd'][curved] - tvd[curved]
+    side = np.zeros(len(curved))
+    for _ in range(max_iter):
+        if len(curved) == 0:
+            break
+        new_md = (a * fb - b * fa) / (fb - fa)
+        seg1 = {key: value[curved] for key, value in p1.items()}
+        seg2 = {key: value[curved] for key, value in p2.items()}
+        f = interp_arrays(new_md, seg1, seg2, dls_resolution)['tvd'] - tvd[curved]
+        md[curved] = new_md
+
+        above = f < 0       # root between new_md and b
+        fb = np.where(above & (side == 1), fb / 2, fb)      # same side twice, halve the kept end
+        fa = np.where(~above & (side == -1), fa / 2, fa)
+        a, fa = np.where(above, new_md, a), np.where(above, f, fa)
+        b, fb = np.where(above, b, new_md), np.where(above, fb, f)
+        side = np.where(above, 1, -1)
+
+        pending = np.abs(f) > tol
+        curved, a, fa, b, fb, side = curved[pending], a[pending], fa[pending], b[pending], fb[pending], side[pending]
+
+    return md
 
 
 def inner_pt_calcs(inner_point, p1, p2, dl_sv=None, dls_resolution=30):
@@ -280,3 +429,81 @@ def interp_vertical(inner_point, md, p1):
     inner_point['sectionType'] = 'vertical'
 
     return inner_point
+
+
+def adjust_azi_array(azi, azi1, azi2):
+    """
+    Vectorized version of adjust_azi
+    """
+    low, high = np.minimum(azi1, azi2), np.maximum(azi1, azi2)
+    for _ in range(3):
+        azi = np.where(azi > high, azi - 90, np.where(azi < low, azi + 90, azi))
+    return azi
+
+
+def get_inc_azi_array(p1, p2, dl_new):
+    """
+    Vectorized version of get_inc_azi
+    :param p1: dict with arrays 'inc' and 'azi' at the upper points
+    :param p2: dict with arrays 'inc', 'azi' and 'dl' at the lower points
+    :param dl_new: dogleg from the upper points in degrees
+    :return: inclination and azimuth arrays
+    """
+    dl2, dl_new = np.radians(p2['dl']), np.radians(dl_new)
+    sin_inc1, sin_inc2 = np.sin(np.radians(p1['inc'])), np.sin(np.radians(p2['inc']))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        c1 = np.sin(dl2 - dl_new) / np.sin(dl2)
+        c2 = np.sin(dl_new) / np.sin(dl2)
+        dn = c1 * sin_inc1 * np.cos(np.radians(p1['azi'])) + c2 * sin_inc2 * np.cos(np.radians(p2['azi']))
+        de = c1 * sin_inc1 * np.sin(np.radians(p1['azi'])) + c2 * sin_inc2 * np.sin(np.radians(p2['azi']))
+        dv = c1 * np.cos(np.radians(p1['inc'])) + c2 * np.cos(np.radians(p2['inc']))
+        inc = np.where(p1['inc'] == p2['inc'], p1['inc'], np.degrees(np.arctan((dn ** 2 + de ** 2) ** .5 / dv)))
+        azi = np.where(p1['azi'] == p2['azi'], p1['azi'], np.degrees((np.arctan(de / dn) + (2 * pi)) % (2 * pi)))
+    azi = adjust_azi_array(azi, p1['azi'], p2['azi'])
+
+    straight = p2['dl'] == 0
+    inc = np.where(straight, p1['inc'], inc)
+    azi = np.where(straight, p1['azi'], azi)
+
+    return inc, azi
+
+
+def interp_arrays(md, p1, p2, dls_resolution=30):
+    """
+    Vectorized version of interp_segment, interpolate many points at once.
+    :param md: array of measured depths, each one between p1 and p2
+    :param p1: dict with arrays md, inc, azi, north, east, tvd and dl at the upper points
+    :param p2: dict with arrays md, inc, azi, north, east, tvd, dl and sectionType at the lower points
+    :param dls_resolution: depth window used for dls
+    :return: dict with arrays md, inc, azi, north, east, tvd, dl, dls and sectionType
+    """
+    md = np.asarray(md, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dl = (md - p1['md']) * p2['dl'] / (p2['md'] - p1['md'])
+        dls = dl * dls_resolution / (md - p1['md'])
+    inc, azi = get_inc_azi_array(p1, p2, dl)
+
+    # curved sections
+    rf = calc_rf_array(np.radians(dl))
+    half_md = 0.5 * (md - p1['md'])
+    sin_inc1, sin_inc = np.sin(np.radians(p1['inc'])), np.sin(np.radians(inc))
+    north = p1['north'] + half_md * (sin_inc1 * np.cos(np.radians(p1['azi'])) + sin_inc * np.cos(np.radians(azi))) * rf
+    east = p1['east'] + half_md * (sin_inc1 * np.sin(np.radians(p1['azi'])) + sin_inc * np.sin(np.radians(azi))) * rf
+    tvd = p1['tvd'] + half_md * (np.cos(np.radians(p1['inc'])) + np.cos(np.radians(inc))) * rf
+
+    # hold sections
+    hold = p2['sectionType'] == 'hold'
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frac = (md - p1['md']) / (p2['md'] - p1['md'])
+    north = np.where(hold, p1['north'] + frac * (p2['north'] - p1['north']), north)
+    east = np.where(hold, p1['east'] + frac * (p2['east'] - p1['east']), east)
+    tvd = np.where(hold, p1['tvd'] + frac * (p2['tvd'] - p1['tvd']), tvd)
+
+    # vertical sections
+    vertical = p2['sectionType'] == 'vertical'
+    north = np.where(vertical, p1['north'], north)
+    east = np.where(vertical, p1['east'], east)
+    tvd = np.where(vertical, p1['tvd'] + (md - p1['md']), tvd)
+
+    return {'md': md, 'inc': inc, 'azi': azi, 'north': north, 'east': east, 'tvd': tvd, 'dl': dl, 'dls': dls,
+            'sectionType': p2['sectionType']}
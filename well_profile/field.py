@@ -0,0 +1,277 @@
+from .anticollision import box_distance, blocks_distance, point_segment_distance
+import numpy as np
+
+
+class Field(object):
+    """
+    Collection of wells with a spatial index over their trajectories, to find the wells passing near a point or
+    a path. The trajectories are taken as straight segments between consecutive points, grouped in blocks with a
+    bounding box, and every well also has a bounding box around all its blocks. The index is built on the first
+    query after adding wells.
+
+    wells: dict {well id: well object} or list of well objects (their positions are used as ids)
+    block_size: number of segments per bounding box
+    """
+    def __init__(self, wells=None, block_size=64):
+        self.wells = {}
+        self.block_size = block_size
+        self._index = None
+        if isinstance(wells, dict):
+            for well_id, well in wells.items():
+                self.add(well, well_id)
+        elif wells is not None:
+            for well in wells:
+                self.add(well)
+
+    def __len__(self):
+        return len(self.wells)
+
+    def __getitem__(self, well_id):
+        return self.wells[well_id]
+
+    def add(self, well, well_id=None):
+        """
+        Include a well in the field
+        :param well: well object
+        :param well_id: id of the well, by default the number of wells already included
+        :return: id of the well
+        """
+        if well_id is None:
+            well_id = len(self.wells)
+        self.wells[well_id] = well
+        self._index = None
+        return well_id
+
+    @property
+    def index(self):
+        """
+        Spatial index, as dict of arrays:
+            points, md: [north, east, tvd] and md of all the points of all the wells
+            segment: position in points of the start of every segment (the end is the next one)
+            block_first, block_end: first and last + 1 position in segment of every block
+            block_min, block_max: bounding box of every block
+            well_first, well_end: first and last + 1 block of every well
+            well_min, well_max: bounding box of every well
+        """
+        if self._index is None:
+            self._index = build_index(list(self.wells.values()), self.block_size)
+        return self._index
+
+    def within(self, location, radius):
+        """
+        Find the wells passing within a distance of a point or a path
+        :param location: point [north, east, tvd], path as array of points or well object
+        :param radius: distance, m or ft
+        :return: dict {well id: list of [md from, md to] ranges inside the radius}
+        """
+        ids, index = list(self.wells), self.index
+        query = query_blocks(location, self.block_size)
+        start, end, groups, query_min, query_max = (query[name] for name in ['start', 'end', 'groups', 'min', 'max'])
+
+        # wells and then pairs of blocks whose boxes are inside the radius
+        lower = box_distance(query_min[:, None], query_max[:, None], index['well_min'], index['well_max'])
+        wells = np.flatnonzero(lower.min(axis=0) <= radius)
+        blocks = ranges(index['well_first'][wells], index['well_end'][wells])
+        lower = box_distance(query_min[:, None], query_max[:, None], index['block_min'][blocks],
+                             index['block_max'][blocks])
+
+        # pairs of segments inside the radius
+        found = {name: [] for name in ['segments', 'query', 'closest']}
+        for group, block in zip(*np.nonzero(lower <= radius)):
+            segments = np.arange(index['block_first'][blocks[block]], index['block_end'][blocks[block]])
+            query = np.arange(groups[group], groups[group + 1])
+            distance, s, t = blocks_distance({'start': index['points'][index['segment'][segments]],
+                                              'end': index['points'][index['segment'][segments] + 1]},
+                                             {'start': start[query], 'end': end[query]})
+            pairs = np.nonzero(distance <= radius)
+            found['segments'].append(segments[pairs[0]])
+            found['query'].append(query[pairs[1]])
+            found['closest'].append(s[pairs])
+
+        if not found['segments']:
+            return {}
+
+        segments, query, closest = (np.concatenate(found[name]) for name in ['segments', 'query', 'closest'])
+        first = index['points'][index['segment'][segments]]
+        last = index['points'][index['segment'][segments] + 1]
+        u_from, u_to = radius_interval(first, last, start[query], end[query], closest, radius)
+        md1 = index['md'][index['segment'][segments]]
+        md2 = index['md'][index['segment'][segments] + 1]
+        md_from, md_to = md1 + u_from * (md2 - md1), md1 + u_to * (md2 - md1)
+        well = np.searchsorted(index['well_first'], np.searchsorted(index['block_first'], segments, side='right') - 1,
+                               side='right') - 1
+
+        result = {}
+        for idx in np.unique(well):
+            in_well = well == idx
+            result[ids[idx]] = merge_ranges(md_from[in_well], md_to[in_well])
+        return result
+
+    def nearest(self, location, k=1):
+        """
+        Find the closest wells to a point or a path
+        :param location: point [north, east, tvd], path as array of points or well object
+        :param k: number of wells
+        :return: list of dicts {'well': well id, 'distance': closest distance, 'md': md at the closest point} sorted by
+            distance
+        """
+        ids, index = list(self.wells), self.index
+        query = query_blocks(location, self.block_size)
+        lower = box_distance(query['min'][:, None], query['max'][:, None], index['well_min'], index['well_max'])
+        lower = lower.min(axis=0)
+
+        found = []
+        for idx in np.argsort(lower):
+            bound = found[k - 1]['distance'] if len(found) >= k else np.inf
+            if lower[idx] >= bound:
+                break
+            closest = closest_to_well(index, idx, query, bound)
+            if closest is not None:
+                found.append({'well': ids[idx], 'distance': closest[0], 'md': closest[1]})
+                found.sort(key=lambda x: x['distance'])
+
+        return found[:k]
+
+
+def closest_to_well(index, well, query, bound=np.inf):
+    """
+    Find the closest point of a well to a set of segments, comparing only the pairs of blocks whose boxes are closer
+    than the best distance found so far
+    :param index: spatial index, see Field.index
+    :param well: position of the well in the index
+    :param query: segments grouped in blocks, see query_blocks
+    :param bound: only distances shorter than this value are searched
+    :return: distance and md of the closest point, or None if the well is not closer than bound
+    """
+    blocks = np.arange(index['well_first'][well], index['well_end'][well])
+    lower = box_distance(query['min'][:, None], query['max'][:, None], index['block_min'][blocks],
+                         index['block_max'][blocks])
+
+    best = None
+    for pair in np.argsort(lower, axis=None):
+        group, block = np.unravel_index(pair, lower.shape)
+        if lower[group, block] >= bound:
+            break
+        segments = np.arange(index['block_first'][blocks[block]], index['block_end'][blocks[block]])
+        query_segments = slice(query['groups'][group], query['groups'][group + 1])
+        distance, s, t = blocks_distance({'start': index['points'][index['segment'][segments]],
+                                          'end': index['points'][index['segment'][segments] + 1]},
+                                         {'start': query['start'][query_segments], 'end': query['end'][query_segments]})
+        segment, closest = np.unravel_index(np.argmin(distance), distance.shape)
+        if distance[segment, closest] < bound:
+            bound = distance[segment, closest]
+            md1, md2 = index['md'][index['segment'][segments[segment]] + np.array([0, 1])]
+            best = (float(bound), float(md1 + s[segment, closest] * (md2 - md1)))
+
+    return best
+
+
+def build_index(wells, block_size=64):
+    """
+    Build the spatial index for a list of wells, see Field.index
+    """
+    points, md, segment = [], [], []
+    block_first, block_end, well_first, well_end = [], [], [], []
+    npoints, nsegments, nblocks = 0, 0, 0
+    for well in wells:
+        well_points = np.column_stack((well.north, well.east, well.tvd))
+        well_md = np.asarray(well.md)
+        if len(well_points) == 1:       # a single point is taken as a segment with zero length
+            well_points, well_md = np.repeat(well_points, 2, axis=0), np.repeat(well_md, 2)
+        count = len(well_points) - 1
+        points.append(well_points)
+        md.append(well_md)
+        segment.append(np.arange(npoints, npoints + count))
+        first = np.arange(nsegments, nsegments + count, block_size)
+        block_first.append(first)
+        block_end.append(np.minimum(first + block_size, nsegments + count))
+        well_first.append(nblocks)
+        well_end.append(nblocks + len(first))
+        npoints, nsegments, nblocks = npoints + count + 1, nsegments + count, nblocks + len(first)
+
+    if not wells:
+        empty = np.empty((0, 3))
+        return {'points': empty, 'md': np.empty(0), 'segment': np.empty(0, dtype=int),
+                'block_first': np.empty(0, dtype=int), 'block_end': np.empty(0, dtype=int),
+                'block_min': empty, 'block_max': empty, 'well_first': np.empty(0, dtype=int),
+                'well_end': np.empty(0, dtype=int), 'well_min': empty, 'well_max': empty}
+
+    index = {'points': np.concatenate(points), 'md': np.concatenate(md), 'segment': np.concatenate(segment),
+             'block_first': np.concatenate(block_first), 'block_end': np.concatenate(block_end),
+             'well_first': np.array(well_first), 'well_end': np.array(well_end)}
+    start = index['points'][index['segment']]
+    end = index['points'][index['segment'] + 1]
+    index['block_min'] = np.minimum(np.minimum.reduceat(start, index['block_first']),
+                                    np.minimum.reduceat(end, index['block_first']))
+    index['block_max'] = np.maximum(np.maximum.reduceat(start, index['block_first']),
+                                    np.maximum.reduceat(end, index['block_first']))
+    index['well_min'] = np.minimum.reduceat(index['block_min'], index['well_first'])
+    index['well_max'] = np.maximum.reduceat(index['block_max'], index['well_first'])
+    return index
+
+
+def query_blocks(location, block_size=64):
+    """
+    Get the segments of a point, path or well grouped in blocks with a bounding box
+    :return: dict with 'start' and 'end' points of the segments, 'groups' (first segment of every block and the number
+        of segments at the end), 'min' and 'max' of every box
+    """
+    if hasattr(location, 'north'):
+        points = np.column_stack((location.north, location.east, location.tvd))
+    else:
+        points = np.atleast_2d(np.asarray(location, dtype=float))
+    start, end = (points, points) if len(points) == 1 else (points[:-1], points[1:])
+
+    groups = np.arange(0, len(start), block_size)
+    return {'start': start, 'end': end, 'groups': np.append(groups, len(start)),
+            'min': np.minimum.reduceat(np.minimum(start, end), groups),
+            'max': np.maximum.reduceat(np.maximum(start, end), groups)}
+
+
+def ranges(first, end):
+    """
+    Concatenate the ranges first[i]:end[i]
+    """
+    lengths = end - first
+    starts = np.cumsum(lengths) - lengths
+    return np.arange(lengths.sum()) - np.repeat(starts, lengths) + np.repeat(first, lengths)
+
+
+def radius_interval(first, last, start, end, closest, radius, iterations=40):
+    """
+    Find the part of every segment (first -> last) inside a radius around another segment (start -> end). The
+    distance to a segment is convex along a line, so the part inside is a single interval around the closest point,
+    and its limits are found by bisection.
+    :param closest: position of the closest point along the segments (from 0 to 1)
+    :return: arrays with the start and end of the intervals (from 0 to 1)
+    """
+    def inside(u):
+        return point_segment_distance(first + u[:, None] * (last - first), start, end)[0] <= radius
+
+    limits = []
+    for side in [0, 1]:
+        outer = np.full(len(first), float(side))
+        found = inside(outer)
+        inner = closest.copy()
+        for _ in range(iterations):
+            middle = (inner + outer) / 2
+            middle_inside = inside(middle)
+            inner = np.where(middle_inside, middle, inner)
+            outer = np.where(middle_inside, outer, middle)
+        limits.append(np.where(found, side, inner))
+    return limits
+
+
+def merge_ranges(md_from, md_to):
+    """
+    Merge overlapping ranges
+    :return: list of [md from, md to], sorted
+    """
+    order = np.argsort(md_from)
+    merged = []
+    for low, high in zip(md_from[order].tolist(), md_to[order].tolist()):
+        if merged and low <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], high)
+        else:
+            merged.append([low, high])
+    return merged
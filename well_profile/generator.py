@@ -1,7 +1,9 @@
 from math import atan, degrees, radians, asin
 from numpy import linspace
+import numpy as np
 import pandas as pd
 from .load_trajectory import load
+from .profiling import stage
 
 
 def two_points(points, inner_points=20):
@@ -21,90 +23,180 @@ def two_points(points, inner_points=20):
     if 'east' not in points['kickoff']:
         points['kickoff']['east'] = 0
 
-    point_1 = points['kickoff']
-    point_2 = points['target']
+    with stage('two_points', 'trajectory') as done:
+        point_1 = points['kickoff']
+        point_2 = points['target']
 
-    # set first section
-    trajectory = [{'md': 0, 'inc': 0, 'azi': 0},
-                  {'md': point_1['tvd'], 'inc': 0, 'azi': 0}]
+        # set first section
+        trajectory = [{'md': 0, 'inc': 0, 'azi': 0},
+                      {'md': point_1['tvd'], 'inc': 0, 'azi': 0}]
 
-    # calculate deltas
-    delta = {'vertical': point_2['tvd'] - point_1['tvd'],
-             'north': point_2['north'] - point_1['north'],
-             'east': point_2['east'] - point_1['east']}
+        # calculate deltas
+        delta = {'vertical': point_2['tvd'] - point_1['tvd'],
+                 'north': point_2['north'] - point_1['north'],
+                 'east': point_2['east'] - point_1['east']}
 
-    delta['horizontal'] = (delta['north']**2 + delta['east']**2)**0.5
+        delta['horizontal'] = (delta['north']**2 + delta['east']**2)**0.5
 
-    # Define azimuth
-    azimuth = 0
-    if delta['north'] != 0 and delta['east'] != 0:
-        beta = degrees(atan(delta['north'] / delta['east']))
-        if delta['east'] > 0:
-            azimuth = 90 - beta
-        else:
-            azimuth = 270 - beta
-
-    else:
-        if delta['north'] == 0:
+        # Define azimuth
+        azimuth = 0
+        if delta['north'] != 0 and delta['east'] != 0:
+            beta = degrees(atan(delta['north'] / delta['east']))
             if delta['east'] > 0:
-                azimuth = 90
-            else:
-                azimuth = 270
-        if delta['east'] == 0:
-            if delta['north'] > 0:
-                azimuth = 0
+                azimuth = 90 - beta
             else:
-                azimuth = 180
-
-    # 3 cases comparing vertical and horizontal displacement
-    steps = inner_points + 1
-    if delta['vertical'] == delta['horizontal']:
-        radius = delta['horizontal']
-        theta = 90
-        arc = radius * radians(theta)
+                azimuth = 270 - beta
 
-        new_md = linspace(point_1['tvd']+arc/steps, point_1['tvd']+arc, steps)
-        new_inc = linspace(theta/steps, theta, steps)
-
-        for md, inc in zip(new_md, new_inc):
-            trajectory.append({'md': md, 'inc': inc, 'azi': azimuth})
-
-        well = load(pd.DataFrame(trajectory), equidistant=False, set_start=point_1)
+        else:
+            if delta['north'] == 0:
+                if delta['east'] > 0:
+                    azimuth = 90
+                else:
+                    azimuth = 270
+            if delta['east'] == 0:
+                if delta['north'] > 0:
+                    azimuth = 0
+                else:
+                    azimuth = 180
+
+        # 3 cases comparing vertical and horizontal displacement
+        steps = inner_points + 1
+        if delta['vertical'] == delta['horizontal']:
+            radius = delta['horizontal']
+            theta = 90
+            arc = radius * radians(theta)
 
-        return well
+            new_md = linspace(point_1['tvd']+arc/steps, point_1['tvd']+arc, steps)
+            new_inc = linspace(theta/steps, theta, steps)
 
-    if delta['vertical'] < delta['horizontal']:
-        # curve section
-        radius = delta['vertical']
-        theta = 90
-        arc = radius * radians(theta)
+            for md, inc in zip(new_md, new_inc):
+                trajectory.append({'md': md, 'inc': inc, 'azi': azimuth})
 
-        new_md = linspace(point_1['tvd'] + arc / steps, point_1['tvd'] + arc, steps)
-        new_inc = linspace(theta / steps, theta, steps)
-        for md, inc in zip(new_md, new_inc):
-            trajectory.append({'md': md, 'inc': inc, 'azi': azimuth})
+        elif delta['vertical'] < delta['horizontal']:
+            # curve section
+            radius = delta['vertical']
+            theta = 90
+            arc = radius * radians(theta)
 
-        # horizontal section
-        trajectory.append({'md': trajectory[-1]['md']+(delta['horizontal']-delta['vertical']), 'inc': 90,
-                           'azi': trajectory[-1]['azi']})
+            new_md = linspace(point_1['tvd'] + arc / steps, point_1['tvd'] + arc, steps)
+            new_inc = linspace(theta / steps, theta, steps)
+            for md, inc in zip(new_md, new_inc):
+                trajectory.append({'md': md, 'inc': inc, 'azi': azimuth})
+
+            # horizontal section
+            trajectory.append({'md': trajectory[-1]['md']+(delta['horizontal']-delta['vertical']), 'inc': 90,
+                               'azi': trajectory[-1]['azi']})
+
+        elif delta['vertical'] > delta['horizontal']:
+            if delta['horizontal'] != 0:
+                radius = (delta['horizontal']**2 + delta['vertical']**2)/(2*delta['horizontal'])
+                theta = degrees(asin(delta['vertical']/radius))
+                arc = radius * radians(theta)
+                new_md = linspace(point_1['tvd'] + arc / steps, point_1['tvd'] + arc, steps)
+                new_inc = linspace(theta / steps, theta, steps)
+            else:
+                new_md = [point_2['tvd']]
+                new_inc = [0]
+            for md, inc in zip(new_md, new_inc):
+                trajectory.append({'md': md, 'inc': inc, 'azi': azimuth})
 
-        well = load(pd.DataFrame(trajectory), equidistant=False, set_start=point_1)
+        trajectory = pd.DataFrame(trajectory)
+        done(trajectory)
 
-        return well
+    return load(trajectory, equidistant=False, set_start=point_1)
 
-    if delta['vertical'] > delta['horizontal']:
-        if delta['horizontal'] != 0:
-            radius = (delta['horizontal']**2 + delta['vertical']**2)/(2*delta['horizontal'])
-            theta = degrees(asin(delta['vertical']/radius))
-            arc = radius * radians(theta)
-            new_md = linspace(point_1['tvd'] + arc / steps, point_1['tvd'] + arc, steps)
-            new_inc = linspace(theta / steps, theta, steps)
-        else:
-            new_md = [point_2['tvd']]
-            new_inc = [0]
-        for md, inc in zip(new_md, new_inc):
-            trajectory.append({'md': md, 'inc': inc, 'azi': azimuth})
 
-        well = load(pd.DataFrame(trajectory), equidistant=False, set_start=point_1)
+def two_points_batch(kickoff, target, inner_points=20, paths=True):
+    """
+    Calculate the geometry of two_points for many pairs of kickoff and target points at once, without building the
+    wells.
+
+    Parameters
+    ----------
+    kickoff: dict
+        {'north': array, 'east': array, 'tvd': array}, north and east are 0 if not included.
+    target: dict
+        {'north': array, 'east': array, 'tvd': array}
+    inner_points: int
+        number of points between curved zone.
+    paths: bool
+        also calculate the points of every path.
+
+    Returns
+    -------
+    result: dict
+        arrays 'azimuth', 'radius' (inf for vertical paths), 'arc' (length of the curved section), 'md' (total md)
+        and 'max_inc', with a value per pair. With paths=True also 'path', a dict of 2D arrays md, inc, azi, north,
+        east and tvd with a row per pair, the same points as two_points (rows are padded with nan at the end).
+    """
+    kickoff_tvd, target_tvd, target_north, target_east = np.broadcast_arrays(
+        *[np.atleast_1d(np.asarray(values, dtype=float)) for values in [kickoff['tvd'], target['tvd'],
+                                                                        target['north'], target['east']]])
+    kickoff_north = np.broadcast_to(np.asarray(kickoff.get('north', 0), dtype=float), kickoff_tvd.shape)
+    kickoff_east = np.broadcast_to(np.asarray(kickoff.get('east', 0), dtype=float), kickoff_tvd.shape)
+
+    delta = {'vertical': target_tvd - kickoff_tvd,
+             'north': target_north - kickoff_north,
+             'east': target_east - kickoff_east}
+    delta['horizontal'] = (delta['north'] ** 2 + delta['east'] ** 2) ** 0.5
+
+    # azimuth, same rules as two_points
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = np.degrees(np.arctan(delta['north'] / delta['east']))
+    azimuth = np.select([(delta['north'] != 0) & (delta['east'] > 0),
+                         delta['north'] != 0,
+                         delta['east'] > 0,
+                         delta['east'] != 0,
+                         delta['north'] > 0],
+                        [90 - beta, np.where(delta['east'] == 0, np.where(delta['north'] > 0, 0, 180), 270 - beta),
+                         90, 270, 0],
+                        180)
 
-        return well
+    # 3 cases comparing vertical and horizontal displacement
+    curve = delta['vertical'] <= delta['horizontal']       # curve to 90° (and horizontal section if shorter)
+    vertical = ~curve & (delta['horizontal'] == 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        radius = np.where(curve, delta['vertical'],
+                          (delta['horizontal'] ** 2 + delta['vertical'] ** 2) / (2 * delta['horizontal']))
+        theta = np.where(curve, 90, np.degrees(np.arcsin(np.clip(delta['vertical'] / radius, -1, 1))))
+        radius = np.where(vertical, np.inf, radius)
+        theta = np.where(vertical, 0, theta)
+        arc = np.where(vertical, 0, radius * np.radians(theta))
+    horizontal = np.where(curve, delta['horizontal'] - delta['vertical'], 0)
+    md = np.where(vertical, target_tvd, kickoff_tvd + arc + horizontal)
+
+    result = {'azimuth': azimuth, 'radius': radius, 'arc': arc, 'md': md, 'max_inc': theta}
+    if not paths:
+        return result
+
+    # points: surface, kickoff, the curve and the end of the horizontal section
+    steps = inner_points + 1
+    fraction = np.arange(1, steps + 1) / steps
+    path_md = np.column_stack((np.zeros(len(md)), kickoff_tvd, kickoff_tvd[:, None] + arc[:, None] * fraction,
+                               np.where(curve & (horizontal > 0), md, np.nan)))
+    path_inc = np.column_stack((np.zeros((len(md), 2)), theta[:, None] * fraction, np.where(curve, 90., np.nan)))
+    path_md[vertical, 2:] = np.nan
+    path_md[vertical, 2] = target_tvd[vertical]
+    path_inc[vertical, 2:] = np.nan
+    path_inc[vertical, 2] = 0
+    path_inc[np.isnan(path_md)] = np.nan
+
+    # the curve is an arc of a circle on the vertical plane of the azimuth
+    along = np.clip(path_md - kickoff_tvd[:, None], 0, None)
+    inc = np.radians(path_inc)
+    in_curve = ~vertical[:, None] & (np.arange(path_md.shape[1]) <= steps + 1)
+    with np.errstate(invalid='ignore'):
+        displacement = np.where(in_curve, radius[:, None] * (1 - np.cos(inc)), radius[:, None] + along - arc[:, None])
+        depth = np.where(in_curve, radius[:, None] * np.sin(inc), radius[:, None])
+    displacement = np.where(vertical[:, None], 0, displacement)
+    depth = np.where(vertical[:, None], along, depth)
+    path_tvd = np.where(path_md <= kickoff_tvd[:, None], path_md, kickoff_tvd[:, None] + depth)
+
+    result['path'] = {'md': path_md, 'inc': path_inc,
+                      'azi': np.where(np.arange(path_md.shape[1]) < 2, 0, azimuth[:, None]),
+                      'north': kickoff_north[:, None] + displacement * np.cos(np.radians(azimuth))[:, None],
+                      'east': kickoff_east[:, None] + displacement * np.sin(np.radians(azimuth))[:, None],
+                      'tvd': path_tvd}
+    for name in ['azi', 'north', 'east', 'tvd']:
+        result['path'][name][np.isnan(path_md)] = np.nan
+    return result
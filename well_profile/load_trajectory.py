@@ -1,8 +1,15 @@
 from .equations import *
 import pandas as pd
-from math import degrees
-from .well import Well, define_section
-from numpy import linspace
+from .well import Well, define_sections, grow_columns, POINT_TYPES
+from .profiling import stage
+import numpy as np
+import io
+import os
+import json
+import struct
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 
 def load(data, **kwargs):
@@ -12,7 +19,7 @@ def load(data, **kwargs):
     Parameters
     ----------
     data:
-        Excel file, dataframe or list of dictionaries.
+        Excel file, csv file, dataframe or list of dictionaries.
         Must contain at least md, inclination and azimuth. Can also contain tvd, northing and easting.
 
     Keyword Args
@@ -25,6 +32,14 @@ def load(data, **kwargs):
             dict, {'dlsResolution', 'wellType': 'onshore'|'offshore', 'units': 'metric'|'english'}.
         inner_pts: num
             include certain amount of inner points between survey stations.
+        chunksize: int, None
+            read a csv file in chunks of this number of rows, so only one chunk is processed at a time. The file is
+            read twice, first to find the empty columns, so the rows kept are the same as when loading it at once.
+            Use keep_base_data=False to avoid holding the whole file in memory.
+        keep_base_data: bool
+            keep the data as read in well._base_data. Default True.
+        compact: bool
+            store the columns as float32, see Well.compact. Default False.
 
 
     Returns
@@ -38,14 +53,15 @@ def load(data, **kwargs):
     change_azimuth = kwargs.get('change_azimuth', None)
     set_info = kwargs.get('set_info', None)
     inner_pts = kwargs.get('inner_points', 0)
+    chunksize = kwargs.get('chunksize', None)
+    keep_base_data = kwargs.get('keep_base_data', True)
+    compact = kwargs.get('compact', False)
 
     info = {'dlsResolution': 30, 'wellType': 'offshore', 'units': 'metric'}
 
     initial_point = {'north': 0, 'east': 0}
 
-    base_data = False
     data_initial = None
-    processed = False
 
     # PROCESSING DATA
 
@@ -59,165 +75,438 @@ def load(data, **kwargs):
             if x in initial_point:
                 initial_point[x] = set_start[x]
 
-    if isinstance(data, pd.DataFrame):
-        base_data = True
-        data_initial = data.copy()
-        data.dropna(axis=1, how='all', inplace=True)
-        data.dropna(inplace=True)
-        data = solve_key_similarities(data)
-        data = data.to_dict('records')
-        processed = True
-
-    if ".xlsx" in data:
-        base_data = True
-        data = pd.read_excel(data)  # open excel file with pandas
-        data_initial = data.copy()
-        data.dropna(axis=1, how='all', inplace=True)
-        data.dropna(inplace=True)
-        data = solve_key_similarities(data)
-        data = data.to_dict('records')
-        processed = True
-
-    if ".csv" in data:
-        base_data = True
-        data = pd.read_csv(data)  # open csv file with pandas
-        data_initial = data.copy()
-        data.dropna(axis=1, how='all', inplace=True)
-        data.dropna(inplace=True)
-        data = solve_key_similarities(data)
-        data = data.to_dict('records')
-        processed = True
-
-    if type(data[0]) is dict:
-        if not processed:
-            data = solve_key_similarities(data)
-        md = [x['md'] for x in data]
-        inc = [x['inc'] for x in data]
-        az = [x['azi'] for x in data]
-    else:       # if data is not a list of dicts, but a list of lists
-        md, inc, az = data[:3]
+    origin = {'md': 0, 'inc': 0, 'azi': 0, 'north': initial_point['north'], 'east': initial_point['east'], 'tvd': 0}
+
+    if isinstance(data, str) and ".csv" in data and chunksize is not None:
+        with stage('load', 'read_chunks') as done:
+            columns, data_initial = read_csv_chunks(data, chunksize, origin, change_azimuth, keep_base_data)
+            done(columns)
+
+    else:
+        with stage('load', 'read') as done:
+            if isinstance(data, pd.DataFrame):
+                data_initial = data.copy() if keep_base_data else None
+
+            elif isinstance(data, str) and ".xlsx" in data:
+                data = pd.read_excel(data)  # open excel file with pandas
+                data_initial = data if keep_base_data else None
+
+            elif isinstance(data, str) and ".csv" in data:
+                data = pd.read_csv(data)  # open csv file with pandas
+                data_initial = data if keep_base_data else None
+            done(data if isinstance(data, pd.DataFrame) or type(data[0]) is dict else data[0])     # one row per station
+
+        with stage('load', 'keys') as done:
+            if isinstance(data, pd.DataFrame):
+                data = solve_key_similarities(data.dropna(axis=1, how='all').dropna())
+                md, inc, az = data['md'].values, data['inc'].values, data['azi'].values
+            elif type(data[0]) is dict:
+                data = solve_key_similarities(data)
+                md = [x['md'] for x in data]
+                inc = [x['inc'] for x in data]
+                az = [x['azi'] for x in data]
+            else:       # if data is not a list of dicts, but a list of lists
+                md, inc, az = data[:3]
+            done(md)
+
+        with stage('load', 'stations') as done:
+            columns = calc_stations(md, inc, az, origin, change_azimuth)
+            done(columns)
+
+    if inner_pts > 0:
+        with stage('load', 'inner_points') as done:
+            columns = add_inner_points(columns, inner_pts, info['dlsResolution'])
+            done(columns)
+
+    with stage('load', 'well') as done:
+        well = Well({'columns': columns, 'info': info})
+        if compact:
+            well.compact()
+        done(columns)
+
+    if data_initial is not None:
+        well._base_data = data_initial
+
+    return well
+
+
+def load_many(sources, workers=None, **kwargs):
+    """
+    Load many wellpaths in parallel, using a pool of processes.
+
+    Parameters
+    ----------
+    sources: list
+        Excel files, csv files, dataframes or lists of dictionaries, any data accepted by load.
+    workers: int, None
+        number of processes. By default the number of CPUs, with 1 the wells are loaded in this process.
+
+    Keyword Args
+    ------------
+        same as load. keep_base_data is False by default, to avoid sending the data back from the processes.
+
+    Returns
+    -------
+    wells: list
+        A wellpath object for every source, in the same order. If a source couldn't be loaded, the exception raised
+        is included in its place instead.
+    """
+    kwargs.setdefault('keep_base_data', False)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [load_or_error(source, kwargs) for source in sources]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(sources) // (4 * workers))
+        return list(executor.map(load_or_error, sources, repeat(kwargs), chunksize=chunksize))
+
+
+def load_or_error(source, kwargs):
+    """
+    Load a wellpath, or get the exception raised while loading it
+    """
+    try:
+        return load(source, **kwargs)
+    except Exception as error:
+        return error
 
+
+def open_well(path):
+    """
+    Open a well saved with Well.save. The columns are memory-mapped, so only the parts that are used are read from
+    the file.
+
+    Parameters
+    ----------
+    path: str
+        NPZ file.
+
+    Returns
+    -------
+    well: well object
+        A wellpath object with 3D position, with read-only columns.
+    """
+    columns = {}
+    origin = None
+    with zipfile.ZipFile(path) as archive:
+        for member in archive.infolist():
+            name = member.filename[:-len('.npy')]
+            if name == 'info':
+                info = json.loads(str(np.lib.format.read_array(archive.open(member))))
+            elif name == 'origin':
+                origin = json.loads(str(np.lib.format.read_array(archive.open(member))))
+            elif member.compress_type == zipfile.ZIP_STORED:
+                columns[name] = map_member(path, member)
+            else:       # compressed members can't be mapped
+                columns[name] = np.lib.format.read_array(archive.open(member))
+
+    return Well({'columns': columns, 'info': info, 'origin': origin})
+
+
+def map_member(path, member):
+    """
+    Memory-map an uncompressed .npy member of a zip file
+    """
+    with io.open(path, 'rb') as file:
+        file.seek(member.header_offset)
+        local_header = file.read(30)
+        name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+        file.seek(member.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+
+    if shape == (0,):
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                     order='F' if fortran_order else 'C')
+
+
+def calc_stations(md, inc, az, start, change_azimuth=None):
+    """
+    Calculate the survey columns for a set of stations, from a known station.
+
+    Parameters
+    ----------
+    md: list or array
+        measured depth of every station. Stations with md <= start md are skipped.
+    inc: list or array
+        inclination of every station, as numbers or strings.
+    az: list or array
+        azimuth of every station, as numbers or strings.
+    start: dict
+        md, inc, azi, north, east and tvd of the station before the first one (tie-in point).
+    change_azimuth: float, int, None
+        add specific degrees to azimuth values.
+
+    Returns
+    -------
+    columns: dict
+        md, inc, azi, north, east, tvd, dl, sectionType and pointType arrays, including the start station.
+    """
     # DEALING WITH NAN-DATA
-    for x, y in enumerate(md):      # change values to numbers if are strings
-        if type(y) == str:
-            md[x] = float(y.split(",", 1)[0])
-            inc[x] = float(inc[x].split(",", 1)[0])
-            az[x] = float(az[x].split(",", 1)[0])
+    md, inc, az = as_floats(md), as_floats(inc), as_floats(az)     # change values to numbers if are strings
 
     # GENERAL CHANGE IN AZIMUTH
     if change_azimuth is not None:
-        for a in range(len(az)):
-            az[a] += change_azimuth
+        az = az + change_azimuth
 
     # CREATING TRAJECTORY POINTS
-    trajectory = [{'md': 0, 'inc': 0, 'azi': 0, 'dl': 0, 'tvd': 0, 'sectionType': 'vertical', 'pointType': 'survey'}]
-    trajectory[-1].update(initial_point)
-    inner_pts += 2
-
-    if md[0] != 0:
-        md = [0] + md
-        inc = [0] + inc
-        az = [0] + az
-
-    for idx, md in enumerate(md):
-        if md > 0:
-            dogleg = calc_dogleg(inc[idx-1], inc[idx], az[idx-1], az[idx])
-            point = {'md': md, 'inc': inc[idx], 'azi': az[idx],
-                     'north': calc_north(trajectory[-1]['north'], trajectory[-1]['md'], md,
-                                         trajectory[-1]['inc'], inc[idx],
-                                         trajectory[-1]['azi'], az[idx],
-                                         dogleg),
-                     'east': calc_east(trajectory[-1]['east'], trajectory[-1]['md'], md,
-                                       trajectory[-1]['inc'], inc[idx],
-                                       trajectory[-1]['azi'], az[idx],
-                                       dogleg),
-                     'tvd': calc_tvd(trajectory[-1]['tvd'], trajectory[-1]['md'], md,
-                                     trajectory[-1]['inc'], inc[idx], dogleg),
-                     'dl': degrees(dogleg),
-                     'pointType': 'survey'
-                     }
-            point['sectionType'] = define_section(point, trajectory[-1])
-            p1 = trajectory[-1]
-
-            if inner_pts > 2:
-                dl_unit = point['dl'] / (inner_pts - 1)
-                condition = sin(radians(p1['inc'])) * sin(radians(point['inc'])) * sin(
-                    radians(point['azi'] - trajectory[-1]['azi']))
-                if condition != 0:
-                    md_segment = linspace(p1['md'], point['md'], inner_pts)[1:-1]
-                    count = 1
-                    for new_md in md_segment:
-                        dl_new = dl_unit * count
-                        inner_point = {'md': new_md, 'dl': dl_unit}
-                        inner_pt_calcs(inner_point, p1, point, dl_sv=dl_new, dls_resolution=info['dlsResolution'])
-                        count += 1
-                        trajectory.append(inner_point)
-                    point['dl'] = dl_unit
-            trajectory.append(point)
-    well = Well({'trajectory': trajectory, 'info': info})
-
-    if base_data:
-        well._base_data = data_initial
+    surveyed = md > start['md']
+    md = np.concatenate(([start['md']], md[surveyed]))
+    inc = np.concatenate(([start['inc']], inc[surveyed]))
+    az = np.concatenate(([start['azi']], az[surveyed]))
+    survey = min_curve(md, inc, az, north=start['north'], east=start['east'], tvd=start['tvd'])
+
+    return {'md': md, 'inc': inc, 'azi': az, 'north': survey['north'], 'east': survey['east'],
+            'tvd': survey['tvd'], 'dl': survey['dl'], 'sectionType': define_sections(inc, survey['tvd']),
+            'pointType': np.zeros(len(md), dtype=np.int8)}
 
-    return well
+
+def read_csv_chunks(path, chunksize, start, change_azimuth=None, keep_base_data=True):
+    """
+    Calculate the survey columns from a csv file read in chunks. The last station of every chunk is the tie-in
+    point for the next one, and the results are written into columns that grow geometrically. As in load, the empty
+    columns are ignored and the rows with any missing value are skipped, so the file is read once more at first to
+    find the empty columns.
+
+    Parameters
+    ----------
+    path: str
+        csv file.
+    chunksize: int
+        number of rows per chunk.
+    start: dict
+        md, inc, azi, north, east and tvd of the initial point.
+    change_azimuth: float, int, None
+        add specific degrees to azimuth values.
+    keep_base_data: bool
+        also return the whole file as dataframe.
+
+    Returns
+    -------
+    columns: dict
+        md, inc, azi, north, east, tvd, dl, sectionType and pointType arrays.
+    base_data: dataframe, None
+    """
+    names = {key: name for name, key in resolve_keys(pd.read_csv(path, nrows=0).columns).items()}
+    names = [names['md'], names['inc'], names['azi']]
+
+    filled = None
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        found = chunk.notna().any()
+        filled = found if filled is None else filled | found
+    required = names if filled is None else filled.index[filled].tolist()
+
+    chunks = []
+    columns = None
+    npoints = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=None if keep_base_data else required):
+        if keep_base_data:
+            chunks.append(chunk)
+        chunk = chunk[required].dropna()
+        stations = calc_stations(*[chunk[name].values for name in names], start, change_azimuth)
+        if columns is not None:     # the tie-in point is already included
+            stations = {name: values[1:] for name, values in stations.items()}
+
+        count = len(stations['md'])
+        columns = grow_columns(stations, npoints + count, columns)
+        for name, values in stations.items():
+            columns[name][npoints:npoints + count] = values
+        npoints += count
+        start = {name: columns[name][npoints - 1] for name in start}
+
+    if columns is None:
+        columns = calc_stations([], [], [], start)
+        npoints = 1
+
+    base_data = pd.concat(chunks, ignore_index=True) if keep_base_data else None
+
+    return {name: values[:npoints] for name, values in columns.items()}, base_data
+
+
+def add_inner_points(columns, inner_pts, dls_resolution=30):
+    """
+    Include interpolated points between the survey stations where the azimuth changes.
+
+    Parameters
+    ----------
+    columns: dict
+        survey columns md, inc, azi, north, east, tvd, dl, sectionType and pointType.
+    inner_pts: int
+        amount of points to include between each pair of survey stations.
+    dls_resolution: num
+        depth window used for dls.
+
+    Returns
+    -------
+    columns: dict
+        new columns including the interpolated points, sorted by md.
+    """
+    names = ['md', 'inc', 'azi', 'north', 'east', 'tvd', 'dl', 'sectionType']
+    inc, azi = columns['inc'], columns['azi']
+
+    # intervals where the azimuth changes, as positions of their lower station
+    condition = np.sin(np.radians(inc[:-1])) * np.sin(np.radians(inc[1:])) * np.sin(np.radians(azi[1:] - azi[:-1]))
+    intervals = np.flatnonzero(condition != 0) + 1
+
+    # every inner point along the arc between its stations, the dogleg from the upper station grows by dl_unit
+    positions = np.repeat(intervals, inner_pts)
+    count = np.tile(np.arange(1, inner_pts + 1), len(intervals))
+    p1 = {x: columns[x][positions - 1] for x in names}
+    p2 = {x: columns[x][positions] for x in names}
+    dl_unit = p2['dl'] / (inner_pts + 1)
+    dl_sv = dl_unit * count
+
+    inner_points = {'md': p1['md'] + count * (p2['md'] - p1['md']) / (inner_pts + 1), 'dl': dl_unit,
+                    'sectionType': p2['sectionType']}
+    inner_points['inc'], inner_points['azi'] = get_inc_azi_array(p1, p2, dl_sv)
+    inner_points.update(min_curve_step(p1, inner_points, dl_sv))
+
+    dl = columns['dl'].copy()
+    dl[intervals] = columns['dl'][intervals] / (inner_pts + 1)
+
+    new_columns = {x: np.insert(dl if x == 'dl' else columns[x], positions, inner_points[x]) for x in names}
+    new_columns['pointType'] = np.insert(columns['pointType'], positions, POINT_TYPES.index('interpolated'))
+
+    return new_columns
+
+
+def min_curve_step(p1, p2, dogleg):
+    """
+    Calculate the position of points from known ones with the minimum curvature method, vectorized
+    :param p1: dict with arrays md, inc, azi, north, east and tvd at the known points
+    :param p2: dict with arrays md, inc and azi at the new points
+    :param dogleg: dogleg between the points in degrees
+    :return: dict with arrays north, east and tvd
+    """
+    rf = calc_rf_array(np.radians(dogleg))
+    half_md = 0.5 * (p2['md'] - p1['md']) * rf
+    sin_inc1, sin_inc2 = np.sin(np.radians(p1['inc'])), np.sin(np.radians(p2['inc']))
+    return {'north': p1['north'] + half_md * (sin_inc1 * np.cos(np.radians(p1['azi'])) +
+                                              sin_inc2 * np.cos(np.radians(p2['azi']))),
+            'east': p1['east'] + half_md * (sin_inc1 * np.sin(np.radians(p1['azi'])) +
+                                            sin_inc2 * np.sin(np.radians(p2['azi']))),
+            'tvd': p1['tvd'] + half_md * (np.cos(np.radians(p1['inc'])) + np.cos(np.radians(p2['inc'])))}
+
+
+def as_floats(values):
+    """
+    Convert a sequence of values to a float array. Values given as strings keep the part before the first comma.
+    """
+    try:
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return np.array([float(x.split(",", 1)[0]) if type(x) == str else x for x in values], dtype=float)
 
 
 def solve_key_similarities(data):
-    md_similarities = ['MD', 'md(ft)', 'md(m)', 'MD(m)', 'MD(ft)', 'MD (ft)',
-                       'measureddepth', 'MeasuredDepth',
-                       'measureddepth(m)', 'MeasuredDepth(m)',
-                       'measureddepth(ft)', 'MeasuredDepth(ft)']
-
-    inc_similarities = ['Inclination', 'inclination', 'Inc', 'Incl', 'incl',
-                        'inclination(°)', 'Inclination(°)', 'Incl(°)', 'Inc°', 'inc°',
-                        'incl(°)', 'Inc(°)', 'inc(°)', 'INC', 'INC(°)', 'INCL',
-                        'INCL(°)', 'Inc(deg)', 'inc(deg)']
-
-    azi_similarities = ['az', 'az(°)',
-                        'Az', 'Az(°)',
-                        'AZ', 'AZ(°)',
-                        'Azi', 'Azi(°)',
-                        'azi(°)', 'Azi°',
-                        'AZI', 'AZI(°)',
-                        'Azimuth', 'Azimuth(°)',
-                        'azimuth', 'azimuth(°)',
-                        'Azi(deg)', 'azi(deg)']
-
-    tvd_similarities = ['TVD', 'TVD (m)', 'TVD (ft)', 'TVD(m)', 'TVD(ft)',
-                        'tvd (m)', 'tvd (ft)', 'tvd(m)', 'tvd(ft)']
-
-    north_similarities = ['NORTH', 'NORTH(m)', 'NORTH(ft)',
-                          'North', 'North(m)', 'North(ft)',
-                          'Northing(m)', 'Northing(ft)'
-                          'N/S(m)', 'N/S(ft)',
-                          'Ns(m)', 'Ns(ft)']
-
-    east_similarities = ['EAST', 'EAST(m)', 'EAST(ft)',
-                         'East', 'East(m)', 'East(ft)',
-                         'Easting(m)', 'Easting(ft)'
-                         'E/W(m)', 'E/W(ft)',
-                         'Ew(m)', 'Ew(ft)']
-
-    possible_keys = [md_similarities,
-                     tvd_similarities,
-                     inc_similarities,
-                     azi_similarities,
-                     north_similarities,
-                     east_similarities]
-
-    correct_keys = ['md', 'tvd', 'inc', 'azi', 'north', 'east']
-
-    true_key = 0
-    for i in possible_keys:
-        for x in i:
-            if isinstance(data, pd.DataFrame):
-                data.columns = data.columns.str.replace(' ', '')
-                if x in data.columns:
-                    data.rename(columns={x: correct_keys[true_key]}, inplace=True)
-            else:
-                if x.replace(' ', '') in data[0]:
-                    for point in data:
-                        point[correct_keys[true_key]] = point[x]
-        true_key += 1
+    """
+    Rename the columns to the keys used by well_profile (md, tvd, inc, azi, north, east).
+
+    Parameters
+    ----------
+    data:
+        dataframe or list of dictionaries.
+
+    Returns
+    -------
+    data:
+        new dataframe with renamed columns, or the same list with the correct keys added to every dictionary.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.rename(columns=resolve_keys(data.columns))
+
+    keys = [(name, key) for name, key in resolve_keys(data[0]).items() if name != key]
+    for point in data:
+        for name, key in keys:
+            point[key] = point[name]
 
     return data
+
+
+def resolve_keys(names):
+    """
+    Find the names that are similar to a key used by well_profile. Names are compared without spaces and case.
+    If several names are similar to the same key, the one equal to the key or else the first one is used.
+
+    Parameters
+    ----------
+    names: iterable
+        column names.
+
+    Returns
+    -------
+    keys: dict
+        {name: key} for the names that were recognised.
+    """
+    keys = {}
+    found = set()
+    for name in sorted(names, key=lambda x: x not in KEY_SIMILARITIES):
+        key = ALIASES.get(normalize_key(name))
+        if key is not None and key not in found:
+            keys[name] = key
+            found.add(key)
+    return keys
+
+
+def register_alias(alias, key):
+    """
+    Recognise a new column name when loading a trajectory.
+
+    Parameters
+    ----------
+    alias: str
+        column name, compared without spaces and case.
+    key: str
+        'md', 'tvd', 'inc', 'azi', 'north' or 'east'.
+    """
+    if key not in KEY_SIMILARITIES:
+        raise ValueError('The key "{}" is not recognised'.format(key))
+    ALIASES[normalize_key(alias)] = key
+
+
+def normalize_key(name):
+    return str(name).replace(' ', '').lower()
+
+
+KEY_SIMILARITIES = {'md': ['MD', 'md(ft)', 'md(m)', 'MD(m)', 'MD(ft)', 'MD (ft)',
+                           'measureddepth', 'MeasuredDepth',
+                           'measureddepth(m)', 'MeasuredDepth(m)',
+                           'measureddepth(ft)', 'MeasuredDepth(ft)'],
+
+                    'tvd': ['TVD', 'TVD (m)', 'TVD (ft)', 'TVD(m)', 'TVD(ft)',
+                            'tvd (m)', 'tvd (ft)', 'tvd(m)', 'tvd(ft)'],
+
+                    'inc': ['Inclination', 'inclination', 'Inc', 'Incl', 'incl',
+                            'inclination(°)', 'Inclination(°)', 'Incl(°)', 'Inc°', 'inc°',
+                            'incl(°)', 'Inc(°)', 'inc(°)', 'INC', 'INC(°)', 'INCL',
+                            'INCL(°)', 'Inc(deg)', 'inc(deg)'],
+
+                    'azi': ['az', 'az(°)',
+                            'Az', 'Az(°)',
+                            'AZ', 'AZ(°)',
+                            'Azi', 'Azi(°)',
+                            'azi(°)', 'Azi°',
+                            'AZI', 'AZI(°)',
+                            'Azimuth', 'Azimuth(°)',
+                            'azimuth', 'azimuth(°)',
+                            'Azi(deg)', 'azi(deg)'],
+
+                    'north': ['NORTH', 'NORTH(m)', 'NORTH(ft)',
+                              'North', 'North(m)', 'North(ft)',
+                              'Northing(m)', 'Northing(ft)',
+                              'N/S(m)', 'N/S(ft)',
+                              'Ns(m)', 'Ns(ft)'],
+
+                    'east': ['EAST', 'EAST(m)', 'EAST(ft)',
+                             'East', 'East(m)', 'East(ft)',
+                             'Easting(m)', 'Easting(ft)',
+                             'E/W(m)', 'E/W(ft)',
+                             'Ew(m)', 'Ew(ft)']}
+
+ALIASES = {normalize_key(alias): key for key, similarities in KEY_SIMILARITIES.items()
+           for alias in [key] + similarities}        # normalized name: key
@@ -1,6 +1,7 @@
-import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+from .anticollision import point_segment_distance
 
 
 def plot_wellpath(well, **kwargs):
@@ -15,52 +16,47 @@ def plot_wellpath(well, **kwargs):
                 'color': str, # color by specific property. e.g. 'dls'|'dl'|'tvd'|'md'|'inc'|'azi'. default = None
                 'size': num, # marker size. default = 2
                 }
+        max_points: maximum number of points per well. default = None (all the points)
+        tolerance: maximum distance between the plotted line and the trajectory, m or ft. default = None
 
     Returns:
         3D Plot - plotly.graph_objects.Figure
     """
 
-    data = {'add_well': None, 'names': None, 'style': None}
+    data = {'add_well': None, 'names': None, 'style': None, 'max_points': None, 'tolerance': None}
     for key, value in kwargs.items():
         data[key] = value
 
     units = well.info['units']
 
-    well1 = pd.DataFrame(well.trajectory)
-    well1["well"] = 1
-    result = well1
-
+    wells = [well]
     if data['add_well'] is not None:
-        wells = []
-
         if type(data['add_well']) is not list:
             data['add_well'] = [data['add_well']]
+        wells += data['add_well']
 
-        well_no = 2
-        for x in data['add_well']:
-            new_well = pd.DataFrame(x.trajectory)
-            new_well["well"] = well_no
-            wells.append(new_well)
-            well_no += 1
-
-        all_wells = well1.append(wells)
-        result = all_wells
-
-    if data['names'] is not None:
-
-        if type(data['names']) is not list:
-            data['names'] = [data['names']]
-
-        well_no = 1
-        for x in data['names']:
-            result.replace({'well': {well_no: x}}, inplace=True)
-            well_no += 1
+    names = well_names(data['names'], list(range(1, len(wells) + 1)))
 
     style = define_style(data['style'])
 
+    # all the wells in a single set of columns
+    columns = ['east', 'north', 'tvd'] + ([style['color']] if style['color'] is not None else [])
+    result, limits = concatenate_wells(wells, ['east', 'north', 'tvd'], columns, data['max_points'], data['tolerance'])
+    result['well'] = np.repeat(np.array(names, dtype=object), np.diff(limits))
+
     if style['color'] is None:
-        color = 'well'
-        fig = px.line_3d(result, x="east", y="north", z="tvd", color=color)
+        fig = go.Figure()
+        colors = px.colors.qualitative.Plotly
+        fig.add_traces([go.Scatter3d(x=result['east'][start:end],
+                                     y=result['north'][start:end],
+                                     z=result['tvd'][start:end],
+                                     mode='lines',
+                                     line=dict(color=colors[idx % len(colors)], dash='solid'),
+                                     name=str(name), legendgroup=str(name), showlegend=True,
+                                     hovertemplate='well=' + str(name) +
+                                                   '<br>east=%{x}<br>north=%{y}<br>tvd=%{z}<extra></extra>')
+                        for idx, (name, start, end) in enumerate(zip(names, limits[:-1], limits[1:]))])
+        fig.update_layout(legend=dict(title=dict(text='well'), tracegroupgap=0))
 
     else:
         fig = go.Figure(
@@ -99,7 +95,7 @@ def plot_wellpath(well, **kwargs):
 
 
 def plot_top_view(well, **kwargs):
-    data = {'add_well': None, 'names': None, 'style': None}
+    data = {'add_well': None, 'names': None, 'style': None, 'max_points': None, 'tolerance': None}
     for key, value in kwargs.items():
         data[key] = value
 
@@ -111,22 +107,16 @@ def plot_top_view(well, **kwargs):
             data['add_well'] = [data['add_well']]
         wells += data['add_well']
 
-    if data['names']:
-        if type(data['names']) is not list:
-            data['names'] = [data['names']]
-    else:
-        data['names'] = []
-        for idx in range(len(wells)):
-            data['names'].append('well ' + str(idx + 1))
+    names = well_names(data['names'], ['well ' + str(idx + 1) for idx in range(len(wells))])
 
+    result, limits = concatenate_wells(wells, ['east', 'north'], ['east', 'north'], data['max_points'],
+                                       data['tolerance'])
     fig = go.Figure()
-
-    for idx, w in enumerate(wells):
-        fig.add_trace(go.Scatter(
-            x=[point['east'] for point in w.trajectory],
-            y=[point['north'] for point in w.trajectory],
-            hovertemplate='<b>North</b>: %{y:.2f}<br>' + '<b>East</b>: %{x}<br>',
-            showlegend=False, name=data['names'][idx]))
+    fig.add_traces([go.Scattergl(x=result['east'][start:end],
+                                 y=result['north'][start:end],
+                                 hovertemplate='<b>North</b>: %{y:.2f}<br>' + '<b>East</b>: %{x}<br>',
+                                 showlegend=False, name=name)
+                    for name, start, end in zip(names, limits[:-1], limits[1:])])
 
     if units == 'metric':
         fig.update_layout(xaxis_title='East, m',
@@ -147,7 +137,8 @@ def plot_top_view(well, **kwargs):
 def plot_vs(well, **kwargs):
     unit_system = well.info['units']
     dls_res = well.info['dlsResolution']
-    data = {'y_axis': 'md', 'x_axis': 'inc', 'add_well': None, 'names': None, 'style': None}
+    data = {'y_axis': 'md', 'x_axis': 'inc', 'add_well': None, 'names': None, 'style': None, 'max_points': None,
+            'tolerance': None}
     for key, value in kwargs.items():
         data[key] = value
 
@@ -163,22 +154,16 @@ def plot_vs(well, **kwargs):
             data['add_well'] = [data['add_well']]
         wells += data['add_well']
 
-    if data['names']:
-        if type(data['names']) is not list:
-            data['names'] = [data['names']]
-    else:
-        data['names'] = []
-        for idx in range(len(wells)):
-            data['names'].append('well ' + str(idx+1))
+    names = well_names(data['names'], ['well ' + str(idx + 1) for idx in range(len(wells))])
 
+    axes = [data['x_axis'], data['y_axis']]
+    result, limits = concatenate_wells(wells, axes, list(dict.fromkeys(axes)), data['max_points'], data['tolerance'])
     fig = go.Figure()
-
-    for idx, w in enumerate(wells):
-        fig.add_trace(go.Scatter(
-            x=[point[data['x_axis']] for point in w.trajectory],
-            y=[point[data['y_axis']] for point in w.trajectory],
-            hovertemplate='<b>y</b>: %{y:.2f}<br>' + '<b>x</b>: %{x:.2f}<br>',
-            showlegend=False, name=data['names'][idx]))
+    fig.add_traces([go.Scattergl(x=result[data['x_axis']][start:end],
+                                 y=result[data['y_axis']][start:end],
+                                 hovertemplate='<b>y</b>: %{y:.2f}<br>' + '<b>x</b>: %{x:.2f}<br>',
+                                 showlegend=False, name=name)
+                    for name, start, end in zip(names, limits[:-1], limits[1:])])
 
     units = ['m', '°']
     for key, axis, in {'0': data['x_axis'], '1': data['y_axis']}.items():
@@ -207,6 +192,107 @@ def plot_vs(well, **kwargs):
     return fig
 
 
+def well_names(names, default):
+    """
+    Get the name of every well, the default names are used for the wells without name
+    """
+    if names is None:
+        return default
+    if type(names) is not list:
+        names = [names]
+    return names[:len(default)] + default[len(names):]
+
+
+def concatenate_wells(wells, axes, columns, max_points=None, tolerance=None):
+    """
+    Get the points to plot of all the wells in a single set of columns
+    :param wells: list of well objects
+    :param axes: properties plotted, used for the decimation
+    :param columns: properties to include
+    :param max_points: maximum number of points per well
+    :param tolerance: maximum distance between the plotted line and the trajectory, in the units of the axes
+    :return: dict of arrays, and the position where every well starts followed by the total number of points
+    """
+    points = [decimate_well(w, axes, max_points, tolerance) for w in wells]
+    result = {name: np.concatenate([get_column(w, name)[idx] for w, idx in zip(wells, points)]) for name in columns}
+    return result, np.cumsum([0] + [len(idx) for idx in points])
+
+
+def get_column(well, name):
+    """
+    Get a property of every point of a well as array
+    """
+    if name == 'sectionType':
+        return well.section_type
+    if name == 'pointType':
+        return well.point_type
+    return getattr(well, name)
+
+
+def decimate_well(well, axes, max_points=None, tolerance=None):
+    """
+    Select the points of a well to plot. The first and last points and the section boundaries are always included,
+    unless the boundaries don't fit in max_points.
+    :param well: well object
+    :param axes: properties plotted, e.g. ['east', 'north', 'tvd']
+    :param max_points: maximum number of points
+    :param tolerance: maximum distance between the plotted line and the trajectory, in the units of the axes
+    :return: sorted positions of the points
+    """
+    if max_points is None and tolerance is None:
+        return np.arange(well.npoints)
+
+    section_type = well.section_type
+    boundary = np.zeros(well.npoints, dtype=bool)
+    boundary[:-1] = section_type[:-1] != section_type[1:]
+    boundary[1:] |= boundary[:-1]
+    if max_points is not None and boundary.sum() + 2 > max_points:
+        boundary[:] = False
+
+    return decimate(np.column_stack([getattr(well, axis) for axis in axes]), boundary, max_points, tolerance)
+
+
+def decimate(points, keep=None, max_points=None, tolerance=None):
+    """
+    Simplify a line (Douglas-Peucker). Starting from the points that must be kept, the point farthest from the
+    simplified line in every interval is included, until all the points are within tolerance or there are max_points.
+    All the intervals are split at once, so it takes one step per level of refinement.
+    :param points: array with shape (number of points, dimensions)
+    :param keep: boolean array, points always included. The first and last points are always included.
+    :param max_points: maximum number of points, it can be exceeded only by the points to keep
+    :param tolerance: maximum distance from the points left out to the simplified line. By default 1e-6, so only
+        the points along straight lines are left out.
+    :return: sorted positions of the selected points
+    """
+    npoints = len(points)
+    max_points = npoints if max_points is None else max_points
+    tolerance = 1e-6 if tolerance is None else tolerance
+    selected = np.zeros(npoints, dtype=bool) if keep is None else np.array(keep, dtype=bool)
+    selected[[0, -1]] = True
+
+    while True:
+        idx = np.flatnonzero(selected)
+        budget = max_points - len(idx)
+        if budget <= 0 or len(idx) == npoints:
+            break
+
+        interval = np.clip(np.searchsorted(idx, np.arange(npoints), side='right') - 1, 0, len(idx) - 2)
+        error = point_segment_distance(points, points[idx[interval]], points[idx[interval + 1]])[0]
+        error[selected] = -1
+
+        # farthest point in every interval
+        farthest = np.maximum.reduceat(error, idx[:-1])
+        candidates = np.flatnonzero((error == farthest[interval]) & (error > tolerance))
+        candidates = candidates[np.unique(interval[candidates], return_index=True)[1]]
+        if len(candidates) == 0:
+            break
+        if len(candidates) > budget:
+            candidates = candidates[np.argsort(error[candidates])[-budget:]]
+        selected[candidates] = True
+
+    return np.flatnonzero(selected)
+
+
 def define_style(style):
     set_style = {'darkMode': False, 'color': None, 'size': 2}
     if style is not None:
@@ -0,0 +1,138 @@
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+
+_profilers = []
+
+
+class profile(object):
+    """
+    Record the time spent in every stage of load, get and two_points while the context is open.
+
+    Parameters
+    ----------
+    callback: function, None
+        called with every stage record as soon as the stage finishes.
+    memory: bool
+        also trace the memory allocated by every stage with tracemalloc (slower).
+
+    Attributes
+    ----------
+    stages: list
+        a dict per stage, in the order they finished: 'function' (load, get or two_points), 'stage', 'time' (wall
+        time, s), 'points' (number of rows produced), 'nbytes' (size of the arrays produced) and, with memory=True,
+        'allocated' (memory still allocated at the end of the stage) and 'peak' (highest memory allocated during the
+        stage, Python 3.9+ only), bytes.
+
+    Examples
+    --------
+    >>> with wp.profile() as profiler:
+    >>>     well = wp.load('trajectory1.xlsx', inner_points=5)
+    >>> profiler.summary()
+    """
+    def __init__(self, callback=None, memory=False):
+        self.callback = callback
+        self.memory = memory
+        self.stages = []
+        self._tracing = False
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        _profilers.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _profilers.remove(self)
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        return False
+
+    def add(self, record):
+        self.stages.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def summary(self):
+        """
+        Get the stages as dataframe
+        """
+        return pd.DataFrame(self.stages)
+
+
+class Stage(object):
+    """
+    Timer for a stage, used as context manager. Call it with the data produced by the stage to count the points and
+    bytes.
+    """
+    def __init__(self, function, name):
+        self.record = {'function': function, 'stage': name, 'time': None, 'points': None, 'nbytes': None}
+        self.memory = any(profiler.memory for profiler in _profilers)
+
+    def __call__(self, data):
+        self.record['points'], self.record['nbytes'] = data_size(data)
+
+    def __enter__(self):
+        if self.memory:
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            self.start_memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.record['time'] = time.perf_counter() - self.start
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.record['allocated'] = current - self.start_memory
+            self.record['peak'] = peak - self.start_memory if hasattr(tracemalloc, 'reset_peak') else None
+        for profiler in _profilers:
+            profiler.add(dict(self.record))
+        return False
+
+
+class NoStage(object):
+    """
+    Stage used when nothing is profiled, does nothing
+    """
+    def __call__(self, data):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NO_STAGE = NoStage()
+
+
+def stage(function, name):
+    """
+    Time a stage of a function if there is an open profile context
+    :param function: name of the function
+    :param name: name of the stage
+    :return: context manager, call it with the data produced by the stage
+    """
+    if not _profilers:
+        return NO_STAGE
+    return Stage(function, name)
+
+
+def data_size(data):
+    """
+    Get the number of rows and bytes of dataframes, arrays, dicts of columns and lists
+    """
+    if isinstance(data, pd.DataFrame):
+        return len(data), int(data.memory_usage(index=False, deep=False).sum())
+    if isinstance(data, np.ndarray):
+        return len(data), data.nbytes
+    if isinstance(data, dict):
+        arrays = [np.asarray(values) for values in data.values()]
+        return (len(arrays[0]) if arrays else 0), sum(values.nbytes for values in arrays)
+    return len(data), None
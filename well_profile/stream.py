@@ -0,0 +1,113 @@
+from .load_trajectory import load, resolve_keys
+import asyncio
+import json
+import math
+
+
+class SurveyFeed(object):
+    """
+    Build a well from a live feed of survey stations. Every station is appended with Well.add_survey and the new
+    point is published to the subscribers. Every subscriber gets a bounded queue, when it is full the oldest point is
+    dropped, so a slow subscriber never stops the ingestion.
+
+    well: well object to append the stations to. By default a new well starting at the surface is created.
+    maxsize: number of points kept for every subscriber.
+    **kwargs: set_start and set_info for the new well, as in load.
+
+    Examples
+    --------
+    >>> feed = wp.SurveyFeed()
+    >>> points = feed.subscribe()
+    >>> await feed.run(stations)        # async iterator of dicts with md, inclination and azimuth
+    """
+    def __init__(self, well=None, maxsize=100, **kwargs):
+        self.well = well if well is not None else load([[], [], []], **kwargs)
+        self.maxsize = maxsize
+        self.subscribers = []
+        self.received = 0
+        self.skipped = 0
+        self.malformed = 0
+        self.dropped = 0
+        self._keys = {}
+
+    def subscribe(self, maxsize=None):
+        """
+        Get a queue that receives every new point (dict as returned by Well.add_survey) and None when the feed ends.
+        Call it from the event loop that runs the feed.
+        :param maxsize: number of points kept, by default the one of the feed
+        :return: asyncio queue
+        """
+        queue = asyncio.Queue(maxsize=maxsize or self.maxsize)
+        self.subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.remove(queue)
+
+    def publish(self, point):
+        """
+        Put a point in every queue without waiting, dropping the oldest point of the full ones
+        """
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(point)
+
+    def add(self, record):
+        """
+        Append a station to the well and publish it. Stations that are not deeper than the last point (repeated or
+        out of order) are skipped and counted in self.skipped, records without valid md, inclination and azimuth are
+        skipped and counted in self.malformed.
+        :param record: dict with md, inclination and azimuth, with any of the column names accepted by load
+        :return: the new point as dict, or None if the station was skipped
+        """
+        self.received += 1
+        try:
+            names = tuple(record)
+            if names not in self._keys:
+                self._keys[names] = {key: name for name, key in resolve_keys(names).items()}
+            keys = self._keys[names]
+            md, inc, azi = (float(record[keys[key]]) for key in ['md', 'inc', 'azi'])
+        except (TypeError, KeyError, ValueError):
+            md = inc = azi = math.nan
+        if math.isnan(md) or math.isnan(inc) or math.isnan(azi):
+            self.malformed += 1
+            return None
+
+        if not md > self.well.md[-1]:
+            self.skipped += 1
+            return None
+
+        point = self.well.add_survey(md, inc, azi)
+        self.publish(point)
+        return point
+
+    async def run(self, stations):
+        """
+        Read all the stations of an async iterator, then publish None to tell the subscribers the feed ended
+        :param stations: async iterator of station dicts
+        :return: well object
+        """
+        try:
+            async for record in stations:
+                self.add(record)
+        finally:
+            self.publish(None)
+        return self.well
+
+
+async def read_json_lines(reader):
+    """
+    Read stations sent as JSON objects, one per line, from an asyncio stream (e.g. a socket opened with
+    asyncio.open_connection)
+    :param reader: asyncio.StreamReader
+    :return: async iterator of dicts, None for the lines that are not valid JSON
+    """
+    async for line in reader:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
@@ -0,0 +1,41 @@
+from unittest import TestCase
+from well_profile import get, load, closest_approach, separation
+from well_profile.anticollision import segments_distance, point_segment_distance
+import numpy as np
+
+
+class TestAntiCollision(TestCase):
+
+    def test_closest_approach(self):
+        well = get(3000, profile='J', kop=500, eob=1500, build_angle=60, change_azimuth=10, step=5)
+        offsets = [get(3000, profile='S', kop=400 + 50 * idx, eob=1200, sod=2000, eod=2600, build_angle=30,
+                       change_azimuth=20 * idx, set_start={'north': 30 * idx, 'east': -20}, step=5) for idx in range(4)]
+        offsets.append(load([[0, 800, 1500], [0, 30, 30], [0, 10, 10]], set_start={'north': 5, 'east': 3}))
+        points = np.column_stack((well.north, well.east, well.tvd))
+
+        for offset in offsets:
+            result = closest_approach(well, offset, block_size=16)
+            offset_points = np.column_stack((offset.north, offset.east, offset.tvd))
+            distance, s, t = segments_distance(points[:-1, None], points[1:, None],
+                                               offset_points[None, :-1], offset_points[None, 1:])     # brute force
+            self.assertAlmostEqual(result['distance'], distance.min(), places=6)
+            self.assertAlmostEqual(np.linalg.norm(result['point'] - result['point_offset']), result['distance'])
+            point = well.get_point(result['md'])
+            self.assertAlmostEqual(point['tvd'], result['point'][2], places=2)
+
+        results = separation(well, offsets, block_size=16)
+        for offset, result in zip(offsets, results):
+            offset_points = np.column_stack((offset.north, offset.east, offset.tvd))
+            distance, t = point_segment_distance(points[:, None], offset_points[None, :-1], offset_points[None, 1:])
+            np.testing.assert_allclose(result['distance'], distance.min(axis=1), atol=1e-6)
+            self.assertTrue(np.all((result['md_offset'] >= 0) & (result['md_offset'] <= offset.md[-1])))
+
+        self.assertEqual(separation(well, offsets[0], block_size=16)['distance'].tolist(), results[0]['distance'].tolist())
+
+    def test_segments_distance(self):
+        distance, s, t = segments_distance(np.array([0, 0, 0]), np.array([10, 0, 0]),
+                                           np.array([[5, -5, 3], [12, 0, 4], [2, 1, 0], [3, 3, 3]]),
+                                           np.array([[5, 5, 3], [20, 0, 4], [8, 1, 0], [3, 3, 3]]))
+        np.testing.assert_allclose(distance, [3, np.sqrt(20), 1, np.sqrt(18)])
+        np.testing.assert_allclose(s, [0.5, 1, 0.2, 0.3])
+        np.testing.assert_allclose(t, [0.5, 0, 0, 0])
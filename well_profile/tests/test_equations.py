@@ -0,0 +1,27 @@
+from unittest import TestCase
+from math import degrees
+from well_profile.equations import calc_dogleg, calc_north, calc_east, calc_tvd, min_curve
+
+
+class TestEquations(TestCase):
+
+    def test_min_curve(self):
+        md = [0, 100, 250, 400, 400.5, 700, 1000]
+        inc = [0, 0, 5.5, 20, 20, 45.3, 89.9]
+        azi = [0, 0, 110, 115.2, 115.2, 90, 350]
+
+        survey = min_curve(md, inc, azi, north=10, east=-5)
+
+        north, east, tvd = 10, -5, 0
+        for idx in range(1, len(md)):
+            dogleg = calc_dogleg(inc[idx - 1], inc[idx], azi[idx - 1], azi[idx])
+            north = calc_north(north, md[idx - 1], md[idx], inc[idx - 1], inc[idx], azi[idx - 1], azi[idx], dogleg)
+            east = calc_east(east, md[idx - 1], md[idx], inc[idx - 1], inc[idx], azi[idx - 1], azi[idx], dogleg)
+            tvd = calc_tvd(tvd, md[idx - 1], md[idx], inc[idx - 1], inc[idx], dogleg)
+            self.assertAlmostEqual(survey['dl'][idx], degrees(dogleg), places=10)
+            self.assertAlmostEqual(survey['north'][idx], north, places=8)
+            self.assertAlmostEqual(survey['east'][idx], east, places=8)
+            self.assertAlmostEqual(survey['tvd'][idx], tvd, places=8)
+
+        self.assertEqual(survey['dl'][0], 0)
+        self.assertEqual(survey['tvd'][1], 100)
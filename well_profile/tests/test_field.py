@@ -0,0 +1,42 @@
+from unittest import TestCase
+from well_profile import get, Field
+from well_profile.anticollision import point_segment_distance
+import numpy as np
+
+
+class TestField(TestCase):
+
+    def test_queries(self):
+        rng = np.random.default_rng(0)
+        wells = {}
+        for idx in range(40):
+            wells['well {}'.format(idx)] = get(2000 + 100 * idx, profile='J', kop=300 + 10 * idx, eob=1500,
+                                               build_angle=rng.uniform(10, 80), change_azimuth=rng.uniform(0, 360),
+                                               set_start={'north': rng.uniform(-1000, 1000),
+                                                          'east': rng.uniform(-1000, 1000)}, step=10)
+        field = Field(wells, block_size=16)
+        point = np.array([100, 200, 1500])
+
+        distances = {}
+        for well_id, well in wells.items():        # brute force
+            points = np.column_stack((well.north, well.east, well.tvd))
+            distance, t = point_segment_distance(point, points[:-1], points[1:])
+            distances[well_id] = distance.min()
+
+        result = field.within(point, 300)
+        self.assertEqual(sorted(result), sorted(x for x in distances if distances[x] <= 300))
+        for well_id, md_ranges in result.items():
+            for md_from, md_to in md_ranges:
+                for md in [md_from, (md_from + md_to) / 2, md_to]:
+                    position = [np.interp(md, wells[well_id].md, getattr(wells[well_id], x))
+                                for x in ['north', 'east', 'tvd']]
+                    self.assertLessEqual(np.linalg.norm(position - point), 300 + 1e-6)
+
+        result = field.nearest(point, k=3)
+        self.assertEqual([x['well'] for x in result], sorted(distances, key=distances.get)[:3])
+        self.assertAlmostEqual(result[0]['distance'], min(distances.values()))
+
+        field.add(get(3000, set_start={'north': 100, 'east': 200}), 'new well')
+        self.assertEqual(field.nearest(point)[0], {'well': 'new well', 'distance': 0, 'md': 1500})
+        self.assertEqual(field.within([[100, 180, 0], [100, 180, 3000]], 25)['new well'], [[0, 3000]])
+        self.assertEqual(Field().within(point, 100), {})
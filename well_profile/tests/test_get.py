@@ -1,5 +1,7 @@
 from unittest import TestCase
-from well_profile import get
+from well_profile import get, plan
+from well_profile.equations import min_curve
+import numpy as np
 
 
 class TestGetTrajectory(TestCase):
@@ -14,6 +16,56 @@ class TestGetTrajectory(TestCase):
 
             run_assertions(self, well, 100)
 
+    def test_closed_form(self):
+        # positions in closed form must be the same as using the minimum curvature method
+        well = get(3000, profile='S', kop=800, eob=1500, sod=2000, eod=2500, build_angle=40, change_azimuth=200,
+                   set_start={'north': 10, 'east': -20})
+        survey = min_curve(well.md, well.inc, well.azi, north=10, east=-20)
+        for param in ['north', 'east', 'tvd', 'dl']:
+            self.assertTrue(np.allclose(getattr(well, param), survey[param]))
+
+        for md in [800, 1500, 2000, 2500]:     # section boundaries are included
+            self.assertIn(md, well.md)
+        self.assertAlmostEqual(well.get_point(1500)['inc'], 40)
+        self.assertAlmostEqual(well.get_point(2500)['inc'], 0)
+
+    def test_resolution(self):
+        params = {'profile': 'S', 'kop': 800, 'eob': 1500.3, 'sod': 2000, 'eod': 2500, 'build_angle': 40}
+        well = get(3000, **params)
+        self.assertEqual(well.npoints, 3002)
+
+        for settings, npoints in [({'step': 10}, 302), ({'points': 50}, 50), ({'curve_points': 5}, 16)]:
+            new_well = get(3000, **params, **settings)
+            run_assertions(self, new_well, 3000)
+            self.assertEqual(new_well.npoints, npoints)
+            for md in [800, 1500.3, 2000, 2500]:
+                self.assertIn(md, new_well.md)
+            for md in [1000, 2200, 2900]:
+                self.assertAlmostEqual(new_well.get_point(md)['tvd'], well.get_point(md)['tvd'])
+
+    def test_plan(self):
+        ranges = {'mdt': [2500, 3000], 'kop': [300, 500], 'eob': [900, 1200], 'sod': [1500, 2000], 'eod': [2200, 2600],
+                  'build_angle': [30, 50]}
+        table = plan('S', ranges, workers=1)
+        self.assertEqual(len(table), 2 ** 6)
+        for _, row in table.iloc[::7].iterrows():
+            well = get(row['mdt'], profile='S', **{x: row[x] for x in ranges if x != 'mdt'})
+            self.assertAlmostEqual(row['tvd'], well.tvd[-1])
+            self.assertAlmostEqual(row['displacement'], well.north[-1])
+            self.assertAlmostEqual(row['max_inc'], well.inc.max())
+            self.assertAlmostEqual(row['max_dls'], well.dls.max())
+
+        target = {'tvd': 2000, 'displacement': 1200}
+        ranges = {'mdt': np.arange(2000, 3000, 50), 'kop': np.arange(0, 1000, 50), 'eob': np.arange(500, 2000, 50),
+                  'build_angle': np.arange(10, 80, 5)}
+        table = plan('J', ranges, target=target, max_dls=3, tolerance=10, top=5, batch_size=5000, workers=2, wells=1)
+        self.assertEqual(len(table), 5)
+        self.assertTrue(np.all(np.diff(table['error']) >= 0))
+        self.assertTrue(np.all(table['max_dls'] <= 3) and np.all(table['error'] <= 10))
+        self.assertTrue(table['eob'].gt(table['kop']).all())       # invalid combinations are discarded
+        self.assertAlmostEqual(table.at[0, 'well'].tvd[-1], table.at[0, 'tvd'])
+        self.assertIsNone(table.at[1, 'well'])
+
 
 def run_assertions(obj, well, mdt):
     traj = well.trajectory
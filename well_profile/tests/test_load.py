@@ -1,6 +1,10 @@
 from unittest import TestCase
-from well_profile import load
+from well_profile import load, load_many, register_alias, profile, get, two_points
 import pandas as pd
+import numpy as np
+import os
+import pickle
+import tempfile
 
 
 class TestLoadTrajectory(TestCase):
@@ -24,6 +28,18 @@ class TestLoadTrajectory(TestCase):
 
         run_assertions(self, well, 3790)
 
+    def test_inner_pts_on_arc(self):
+        survey = [[0, 500, 1000, 1500, 2000], [0, 0, 10, 30, 60], [0, 0, 45, 60, 120]]
+        well = load(survey)
+        well_inner = load(survey, inner_points=4)
+        inner = well_inner.point_type == 'interpolated'
+
+        self.assertEqual(inner.sum(), 4 * 2)     # only where the azimuth changes with inclination
+        self.assertTrue(np.all(np.diff(well_inner.md) > 0))
+        expected = well.get_points(well_inner.md[inner])
+        for name in ['inc', 'azi', 'north', 'east', 'tvd']:
+            np.testing.assert_allclose(getattr(well_inner, name)[inner], expected[name], atol=1e-9)
+
     def test_load_from_df(self):
 
         df = pd.read_excel(r'https://github.com/pro-well-plan/well_profile/raw/master/well_profile/tests/'
@@ -46,6 +62,71 @@ class TestLoadTrajectory(TestCase):
 
         run_assertions(self, well, 5)
 
+    def test_key_similarities(self):
+
+        df = pd.DataFrame({'MD (ft)': [0, 100, 200], 'Incl (°)': [0, 5, 10], 'azimuth': [0, 30, 30],
+                           'Depth (ft)': [0, 99, 198]})
+        register_alias('depth(ft)', 'tvd')
+        well = load(df)
+
+        self.assertEqual(list(df.columns), ['MD (ft)', 'Incl (°)', 'azimuth', 'Depth (ft)'])
+        self.assertEqual(list(well._base_data.columns), list(df.columns))
+        self.assertEqual(well.md.tolist(), [0, 100, 200])
+        self.assertEqual(well.inc.tolist(), [0, 5, 10])
+        self.assertEqual(well.azi.tolist(), [0, 30, 30])
+        self.assertRaises(ValueError, register_alias, 'Depth', 'depth')
+
+    def test_load_csv_chunks(self):
+
+        df = pd.DataFrame({'MD': [0, 100, 200, 300, 400, 500, 600],
+                           'Inc': [0, 0, 5, 12.5, None, 30, 30],
+                           'Azi': [0, 0, 120, 125, 130, 128.3, 128.3]})
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'survey.csv')
+            df.to_csv(path, index=False)
+            well = load(path, set_start={'north': 10}, change_azimuth=5)
+            for chunksize in [1, 2, 4, 10]:
+                well_chunks = load(path, chunksize=chunksize, set_start={'north': 10}, change_azimuth=5,
+                                   keep_base_data=False)
+                for column in ['md', 'inc', 'azi', 'north', 'east', 'tvd', 'dl', 'dls']:
+                    np.testing.assert_allclose(getattr(well_chunks, column), getattr(well, column), atol=1e-9)
+                self.assertEqual(well_chunks.section_type.tolist(), well.section_type.tolist())
+                self.assertFalse(hasattr(well_chunks, '_base_data'))
+
+            well_chunks = load(path, chunksize=3)
+            self.assertEqual(len(well_chunks._base_data), len(df))
+
+            df['TVD'] = [0, 100, None, 299.5, 399, 497, 594]        # a missing value drops the row
+            df['Comment'] = None        # an empty column is ignored
+            df.to_csv(path, index=False)
+            well = load(path)
+            self.assertEqual(well.md.tolist(), [0, 100, 300, 500, 600])
+            for chunksize in [1, 2, 4, 10]:
+                for keep_base_data in [True, False]:
+                    well_chunks = load(path, chunksize=chunksize, keep_base_data=keep_base_data)
+                    for column in ['md', 'inc', 'azi', 'north', 'east', 'tvd', 'dl']:
+                        np.testing.assert_allclose(getattr(well_chunks, column), getattr(well, column), atol=1e-9)
+
+        run_assertions(self, well, 600)
+
+    def test_load_many(self):
+
+        sources = [[[0, 100, 200], [0, 5, 10], [0, 30, 30]],
+                   [[0, 100, 200], [0, 5, 'x'], [0, 30, 30]],
+                   [[0, 300, 600, 900], [0, 0, 20, 40], [0, 0, 90, 95]]]
+
+        for workers in [1, 2]:
+            wells = load_many(sources, workers=workers, inner_points=1)
+            self.assertIsInstance(wells[1], ValueError)
+            for source, well in zip(sources[::2], wells[::2]):
+                self.assertEqual(well.trajectory, load(source, inner_points=1).trajectory)
+
+        well = wells[2]
+        dls = well.dls
+        saved_well = pickle.loads(pickle.dumps(well))     # derived columns are not pickled
+        self.assertEqual(saved_well._cache, {})
+        np.testing.assert_array_equal(saved_well.dls, dls)
+
     def test_load_from_lists(self):
 
         data = [[0, 1, 2, 3, 4, 5],
@@ -72,6 +153,33 @@ class TestLoadTrajectory(TestCase):
         self.assertIsInstance(well, object, msg='main function is not returning an object')
         self.assertIsInstance(well_initial, pd.DataFrame, msg='method is not returning a dataframe')
 
+    def test_profile(self):
+        data = pd.DataFrame({'md': [0, 500, 1000, 1500], 'inc': [0, 0, 30, 60], 'azi': [0, 0, 45, 45]})
+        records = []
+        with profile(callback=records.append) as profiler:
+            well = load(data, inner_points=2)
+            get(1000, profile='J', kop=200, eob=500, build_angle=30)
+            two_points({'kickoff': {'tvd': 300}, 'target': {'north': 500, 'east': 200, 'tvd': 900}})
+
+        stages = [(x['function'], x['stage']) for x in profiler.stages]
+        self.assertEqual(stages[:5], [('load', 'read'), ('load', 'keys'), ('load', 'stations'),
+                                      ('load', 'inner_points'), ('load', 'well')])
+        self.assertEqual(stages[5:8], [('get', 'md'), ('get', 'stations'), ('get', 'well')])
+        self.assertEqual(stages[8], ('two_points', 'trajectory'))
+        self.assertEqual(records, profiler.stages)
+        self.assertEqual(profiler.stages[4]['points'], well.npoints)
+        self.assertTrue(all(x['time'] >= 0 for x in profiler.stages))
+
+        # nothing is recorded once the context is closed
+        load(data)
+        self.assertEqual(len(profiler.stages), len(records))
+
+        with profile() as profiler:     # stations are counted for every type of data
+            for source in [data, data.to_dict('records'), [data['md'].tolist(), data['inc'].tolist(),
+                                                           data['azi'].tolist()]]:
+                load(source)
+        self.assertEqual([x['points'] for x in profiler.stages if x['stage'] == 'read'], [4, 4, 4])
+
 
 def run_assertions(obj, well, mdt):
     traj = well.trajectory
@@ -1,5 +1,8 @@
 from unittest import TestCase
-from well_profile import load
+from well_profile import load, get
+from well_profile.plot import decimate_well
+from well_profile.anticollision import point_segment_distance
+import numpy as np
 
 
 class TestPlots(TestCase):
@@ -25,3 +28,55 @@ class TestPlots(TestCase):
     def test_vs_view(self):
         well = load(r'https://github.com/pro-well-plan/well_profile/raw/master/well_profile/tests/trajectory1.xlsx')
         well.plot(plot_type='vs', x_axis='md', y_axis='tvd')
+
+    def test_decimation(self):
+        well = get(5000, profile='S', kop=1000, eob=2000, sod=3000, eod=4000, build_angle=40, change_azimuth=30)
+        points = np.column_stack((well.east, well.north, well.tvd))
+
+        for tolerance in [0.01, 1]:
+            idx = decimate_well(well, ['east', 'north', 'tvd'], tolerance=tolerance)
+            interval = np.clip(np.searchsorted(idx, np.arange(well.npoints), side='right') - 1, 0, len(idx) - 2)
+            error = point_segment_distance(points, points[idx[interval]], points[idx[interval + 1]])[0]
+            self.assertLessEqual(error.max(), tolerance)
+            self.assertTrue({0, well.npoints - 1} <= set(idx))
+
+        fig = well.plot(add_well=get(3000), max_points=100)
+        self.assertEqual(len(fig.data[0].x), 100)
+        self.assertEqual(len(fig.data[1].x), 2)
+        fig = well.plot(plot_type='top', tolerance=0.5)
+        self.assertLess(len(fig.data[0].x), well.npoints / 10)
+        fig = well.plot(plot_type='vs', x_axis='inc', y_axis='md', max_points=20)
+        self.assertEqual(fig.data[0].y[-1], 5000)
+
+    def test_decimation_survey(self):
+        # every point of a loaded survey is a survey station, they are decimated too
+        generated = get(10000, profile='S', kop=1000, eob=3000, sod=5000, eod=7000, build_angle=40, change_azimuth=30,
+                        step=0.5)
+        well = load([generated.md.tolist(), generated.inc.tolist(), generated.azi.tolist()])
+        self.assertEqual(well.npoints, 20001)
+
+        fig = well.plot(max_points=100)
+        self.assertEqual(len(fig.data[0].x), 100)
+        fig = well.plot(tolerance=1.0)
+        self.assertLess(len(fig.data[0].x), 200)
+        self.assertEqual(fig.data[0].z[-1], well.tvd[-1])
+
+        well = load([[0, 500, 1000, 1500, 2000, 2500], [0, 0, 10, 30, 45, 60], [0, 0, 45, 60, 90, 120]],
+                    inner_points=20)
+        fig = well.plot(max_points=50)
+        self.assertEqual(len(fig.data[0].x), 50)
+
+    def test_multiple_wells(self):
+        wells = [get(3000, profile='J', kop=500 + 100 * idx, eob=2000, build_angle=40, change_azimuth=30 * idx)
+                 for idx in range(4)]
+
+        fig = wells[0].plot(add_well=wells[1:], names=['first', 'second'])
+        self.assertEqual([trace.name for trace in fig.data], ['first', 'second', '3', '4'])
+        self.assertEqual(list(fig.data[3].x), list(wells[3].east))
+        self.assertEqual(fig.layout.legend.title.text, 'well')
+
+        for plot_type in ['top', 'vs']:
+            fig = wells[0].plot(plot_type=plot_type, add_well=wells[1:], names='first')
+            self.assertEqual([trace.type for trace in fig.data], ['scattergl'] * 4)
+            self.assertEqual(list(fig.data[2].y), list(wells[2].north if plot_type == 'top' else wells[2].md))
+            self.assertEqual([trace.name for trace in fig.data], ['first', 'well 2', 'well 3', 'well 4'])
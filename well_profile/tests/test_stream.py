@@ -0,0 +1,73 @@
+from unittest import TestCase
+from well_profile import load, SurveyFeed, read_json_lines
+import numpy as np
+import asyncio
+import json
+
+
+SURVEY = [[0, 500, 1000, 1500, 2000, 2500], [0, 0, 10, 30, 30, 20], [0, 0, 45, 60, 60, 80]]
+
+
+async def stations(records):
+    for record in records:
+        await asyncio.sleep(0)
+        yield record
+
+
+class TestSurveyFeed(TestCase):
+
+    def test_feed(self):
+        records = [{'MD': md, 'Inc': inc, 'Azi': azi} for md, inc, azi in zip(*SURVEY)]
+        records.insert(3, records[2])       # repeated station
+        records[4:4] = [{'MD': 1200, 'Inc': 'bad', 'Azi': 50}, {'MD': 1200, 'Azi': 50}, None, {'MD': 1200}]
+
+        async def main():
+            feed = SurveyFeed(maxsize=2)
+            fast, slow = feed.subscribe(maxsize=10), feed.subscribe()
+            received = []
+
+            async def consume():
+                while True:
+                    point = await fast.get()
+                    if point is None:
+                        break
+                    received.append(point['md'])
+
+            consumer = asyncio.ensure_future(consume())
+            well = await feed.run(stations(records))
+            await consumer
+            return feed, well, received, [slow.get_nowait() for _ in range(slow.qsize())]
+
+        feed, well, received, left = asyncio.run(main())
+        expected = load(SURVEY)
+
+        np.testing.assert_allclose(well.tvd, expected.tvd, atol=1e-9)
+        self.assertEqual(received, SURVEY[0][1:])
+        self.assertEqual(feed.skipped, 2)       # the first station and the repeated one
+        self.assertEqual(feed.malformed, 4)
+        self.assertEqual(left[0]['md'], SURVEY[0][-1])     # the slow subscriber only keeps the newest points
+        self.assertIsNone(left[1])
+        self.assertEqual(feed.dropped, 4)
+
+    def test_socket(self):
+        lines = ''.join(json.dumps({'md': md, 'inc': inc, 'azi': azi}) + '\n' for md, inc, azi in zip(*SURVEY))
+        lines = lines.replace('\n', '\n{"md": 12\n', 1)      # a broken line
+
+        async def main():
+            async def send(reader, writer):
+                writer.write(lines.encode())
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(send, '127.0.0.1', 0)
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            feed = SurveyFeed()
+            well = await feed.run(read_json_lines(reader))
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return feed, well
+
+        feed, well = asyncio.run(main())
+        self.assertEqual(feed.malformed, 1)
+        np.testing.assert_allclose(well.north, load(SURVEY).north, atol=1e-9)
@@ -1,5 +1,6 @@
 from unittest import TestCase
-from well_profile import two_points, load
+from well_profile import two_points, two_points_batch, load
+import numpy as np
 
 
 class TestTwoPoints(TestCase):
@@ -49,6 +50,24 @@ class TestTwoPoints(TestCase):
         self.assertEqual(max([p['dls'] for p in well.trajectory]), max([p['dls'] for p in well2.trajectory]),
                          msg='max dls is different')
 
+    def test_batch(self):
+        # the three cases, and a vertical well
+        kickoff = {'north': [50, -35, 100, 0], 'east': [20, 21, -48, 0], 'tvd': [300, 300, 300, 300]}
+        target = {'north': [0, -100, 500, 0], 'east': [-500, 800, 0, 0], 'tvd': [800, 800, 1900, 900]}
+        result = two_points_batch(kickoff, target, inner_points=10)
+
+        for idx in range(4):
+            well = two_points({'kickoff': {x: values[idx] for x, values in kickoff.items()},
+                               'target': {x: values[idx] for x, values in target.items()}}, inner_points=10)
+            self.assertAlmostEqual(result['md'][idx], well.md[-1])
+            self.assertAlmostEqual(result['max_inc'][idx], well.inc.max())
+            for name in ['md', 'inc', 'azi', 'north', 'east', 'tvd']:
+                path = result['path'][name][idx]
+                np.testing.assert_allclose(path[~np.isnan(path)], getattr(well, name), atol=1e-6)
+
+        self.assertEqual(result['radius'][3], np.inf)
+        self.assertNotIn('path', two_points_batch(kickoff, target, paths=False))
+
 
 def run_assertions(obj, well, mdt):
     traj = well.trajectory
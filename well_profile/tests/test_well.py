@@ -1,5 +1,9 @@
 from unittest import TestCase
-from well_profile import load
+from well_profile import load, open_well
+from well_profile.equations import interp_pt, scan_tvd
+import numpy as np
+import os
+import tempfile
 
 
 class TestLoadTrajectory(TestCase):
@@ -45,6 +49,199 @@ class TestLoadTrajectory(TestCase):
         with self.assertRaises(ValueError):     # raising error for deeper TVD than deepest trajectory TVD
             well.get_point(3246, depth_type='tvd')
 
+    def test_columns(self):
+        well = load([[0, 500, 1000, 1500, 2000], [0, 0, 10, 30, 30], [0, 0, 45, 60, 60]])
+
+        self.assertIsInstance(well.md, np.ndarray)
+        self.assertEqual(well.md.dtype, np.float64)
+        self.assertTrue(np.shares_memory(well.md, well.md))     # column reads are views, not copies
+        with self.assertRaises(ValueError):         # columns are read-only
+            well.tvd[0] = 10
+        self.assertEqual(list(well.section_type), ['vertical', 'vertical', 'build-up', 'build-up', 'hold'])
+
+        traj = well.trajectory
+        self.assertIs(traj, well.trajectory)        # view is built only once
+        self.assertEqual(len(traj), well.npoints)
+        for idx, point in enumerate(traj):
+            for param in ['md', 'inc', 'azi', 'north', 'east', 'tvd', 'dl', 'dls']:
+                self.assertEqual(point[param], getattr(well, param)[idx])
+        self.assertEqual(traj[0]['delta'], {'md': 0, 'tvd': 0, 'inc': 0, 'azi': 0, 'dl': 0, 'dls': 0, 'north': 0,
+                                            'east': 0})
+        self.assertEqual(traj[3]['delta']['tvd'], traj[3]['tvd'] - traj[2]['tvd'])
+        self.assertEqual(traj[3]['pointType'], 'survey')
+
+    def test_get_point_index(self):
+        well = load([[0, 500, 1000, 1500, 2000, 2500], [0, 0, 10, 30, 30, 45], [0, 0, 45, 60, 60, 75]])
+
+        for md in np.linspace(0, 2500, 37):
+            p = well.get_point(md)
+            expected = interp_pt(md, well.trajectory)
+            self.assertEqual(p.keys(), expected.keys())
+            for key in p:
+                if isinstance(p[key], float):
+                    self.assertAlmostEqual(p[key], expected[key])
+                elif key != 'delta':
+                    self.assertEqual(p[key], expected[key])
+
+    def test_get_points(self):
+        well = load([[0, 500, 1000, 1500, 2000, 2500], [0, 0, 10, 30, 30, 45], [0, 0, 45, 60, 60, 75]])
+        depths = np.linspace(0, 2500, 37)
+        points = well.get_points(depths)
+
+        self.assertEqual(len(points['md']), len(depths))
+        for idx, md in enumerate(depths):
+            p = well.get_point(md)
+            for key in ['md', 'north', 'east', 'tvd', 'dl', 'sectionType', 'pointType']:
+                self.assertAlmostEqual(points[key][idx], p[key])
+            if 'inc' in p:
+                self.assertAlmostEqual(points['inc'][idx], p['inc'])
+                self.assertAlmostEqual(points['azi'][idx], p['azi'])
+
+        with self.assertRaises(ValueError):
+            well.get_points([100, 3000])
+        with self.assertRaises(ValueError):
+            well.get_points([100], depth_type='depth')
+
+    def test_get_points_tvd(self):
+        # build-up over 90° makes the well go up again after the deepest TVD
+        well = load([[0, 500, 1000, 1500, 2000], [0, 0, 60, 95, 95], [0, 0, 30, 40, 40]])
+        tvds = np.linspace(0, well.tvd.max(), 50)
+        points = well.get_points(tvds, depth_type='tvd')
+
+        for idx, tvd in enumerate(tvds):
+            self.assertAlmostEqual(points['tvd'][idx], tvd, places=2)
+            p = well.get_point(tvd, depth_type='tvd')
+            self.assertAlmostEqual(p['md'], points['md'][idx])
+            self.assertAlmostEqual(p['md'], scan_tvd(tvd, well.trajectory)['md'])
+        self.assertTrue(np.all(np.diff(points['md']) > 0))      # first time reaching each TVD
+        self.assertTrue(points['md'][-1] < well.md[-1])
+
+        with self.assertRaises(ValueError):
+            well.get_points([well.tvd.max() + 1], depth_type='tvd')
+
+    def test_lazy_columns(self):
+        well = load([[0, 500, 1000, 1500, 2000], [0, 0, 10, 30, 30], [0, 0, 45, 60, 60]])
+        self.assertEqual(well._cache, {})       # nothing derived is calculated when the well is created
+
+        dls = well.dls
+        self.assertAlmostEqual(dls[2], well.dl[2] * 30 / 500)
+        self.assertIs(well._derived('dls'), well._derived('dls'))
+        self.assertEqual(list(well.deltas['md']), [0, 500, 500, 500, 500])
+
+        well.info['dlsResolution'] = 100
+        self.assertAlmostEqual(well.dls[2], well.dl[2] * 100 / 500)
+
+        well.trajectory = well.trajectory[:3]       # changing the trajectory drops the derived columns
+        self.assertEqual(len(well.dls), 3)
+        self.assertEqual(len(well.deltas['tvd']), 3)
+
+    def test_df(self):
+        well = load([[0, 500, 1000, 1500, 2000], [0, 0, 10, 30, 30], [0, 0, 45, 60, 60]], inner_points=2)
+        df = well.df()
+
+        self.assertEqual(list(df.columns), ['md', 'inc', 'azi', 'north', 'east', 'tvd', 'dl', 'dls', 'sectionType',
+                                            'pointType', 'delta_md', 'delta_tvd', 'delta_inc', 'delta_azi',
+                                            'delta_dl', 'delta_dls', 'delta_north', 'delta_east'])
+        for idx, point in enumerate(well.trajectory):
+            row = df.iloc[idx]
+            for key, value in point.items():
+                if key == 'delta':
+                    for name in value:
+                        self.assertEqual(row['delta_' + name], value[name])
+                else:
+                    self.assertEqual(row[key], value)
+
+        self.assertTrue(np.shares_memory(df['md'].values, well.md))       # built without copying the columns
+        self.assertEqual(df['sectionType'].dtype, 'category')
+        self.assertEqual(df['pointType'].cat.categories.tolist(), ['survey', 'interpolated'])
+        df['new'] = 0
+        self.assertNotIn('new', well.df())
+        with self.assertRaises(ValueError):     # the columns are read-only
+            df.loc[1, 'tvd'] = -999
+        well.info['dlsResolution'] = 100        # the dataframe follows the changes of the well
+        self.assertAlmostEqual(well.df()['dls'][2], well.dls[2])
+        well.trajectory = well.trajectory[:3]
+        self.assertEqual(len(well.df()), 3)
+
+    def test_save(self):
+        well = load([[0, 500, 1000, 1500, 2000], [0, 0, 10, 30, 30], [0, 0, 45, 60, 60]], inner_points=2,
+                    set_info={'units': 'english'})
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'well')
+            well.save(path)
+            saved_well = open_well(path + '.npz')
+
+            self.assertEqual(saved_well.info, well.info)
+            self.assertEqual(saved_well.trajectory, well.trajectory)
+            self.assertEqual(saved_well.get_point(800, 'tvd'), well.get_point(800, 'tvd'))
+            self.assertFalse(saved_well.md.flags.writeable)
+            del saved_well
+
+            well.info['dlsResolution'] = np.int64(100)      # numpy values are saved as python ones
+            well.info['wellType'] = np.str_('onshore')
+            well.save(path)
+            saved_well = open_well(path + '.npz')
+            self.assertEqual(saved_well.info, {'dlsResolution': 100, 'wellType': 'onshore', 'units': 'english'})
+            np.testing.assert_array_equal(saved_well.tvd, well.tvd)
+            del saved_well
+
+    def test_add_survey(self):
+        survey = [[0, 500, 1000, 1500, 2000, 2500], [0, 0, 10, 30, 30, 20], [0, 0, 45, 60, 60, 80]]
+        well = load(survey)
+        well_added = load([values[:2] for values in survey])
+        well_added.deltas, well_added.dls, well_added.tvd_index      # cached columns are extended
+        for md, inc, azi in zip(*[values[2:] for values in survey]):
+            point = well_added.add_survey(md, inc, azi)
+            self.assertEqual(point['md'], md)
+
+        self.assertEqual(well_added.npoints, well.npoints)
+        for name in ['md', 'inc', 'azi', 'north', 'east', 'tvd', 'dl', 'dls', 'tvd_index']:
+            np.testing.assert_allclose(getattr(well_added, name), getattr(well, name), atol=1e-9)
+        for name, values in well.deltas.items():
+            np.testing.assert_allclose(well_added.deltas[name], values, atol=1e-9)
+        self.assertEqual(well_added.section_type.tolist(), well.section_type.tolist())
+
+        # a saved well is read-only but stations can still be added
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'well.npz')
+            well.save(path)
+            saved_well = open_well(path)
+            saved_well.add_survey(3000, 20, 80)
+            self.assertEqual(saved_well.npoints, well.npoints + 1)
+            self.assertAlmostEqual(saved_well.tvd[-1] - saved_well.tvd[-2], 500 * np.cos(np.radians(20)))
+            del saved_well
+
+        with self.assertRaises(ValueError):
+            well.add_survey(2500, 20, 80)
+
+    def test_compact(self):
+        survey = [[0, 500, 1000, 1500, 2000, 2500], [0, 0, 10, 30, 30, 20], [0, 0, 45, 60, 60, 80]]
+        start = {'north': 6500000, 'east': 450000}
+        well = load(survey, inner_points=3, set_start=start)
+        compact_well = load(survey, inner_points=3, set_start=start, compact=True)
+
+        self.assertTrue(compact_well.is_compact)
+        self.assertEqual(compact_well._columns['north'].dtype, np.float32)
+        np.testing.assert_array_equal(compact_well.md, well.md)
+        for name, tolerance in [('north', 1e-3), ('east', 1e-3), ('tvd', 1e-3), ('inc', 1e-4), ('azi', 1e-4),
+                                ('dls', 1e-5)]:
+            self.assertEqual(getattr(compact_well, name).dtype, np.float64)
+            np.testing.assert_allclose(getattr(compact_well, name), getattr(well, name), rtol=0, atol=tolerance)
+        self.assertEqual(compact_well.get_point(1000)['pointType'], 'survey')
+        self.assertAlmostEqual(compact_well.get_point(1200)['north'], well.get_point(1200)['north'], places=3)
+
+        point = compact_well.add_survey(3000, 20, 90)
+        self.assertAlmostEqual(point['east'], well.add_survey(3000, 20, 90)['east'], places=3)
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'well.npz')
+            compact_well.save(path)
+            saved_well = open_well(path)
+            self.assertTrue(saved_well.is_compact)
+            np.testing.assert_array_equal(saved_well.north, compact_well.north)
+            del saved_well
+
 
 def run_assertions(obj, well, mdt):
     traj = well.trajectory
@@ -1,43 +1,335 @@
 from .equations import *
 from .plot import plot_wellpath, plot_top_view, plot_vs
 import pandas as pd
+import numpy as np
+import json
+
+
+SECTION_TYPES = ['vertical', 'hold', 'build-up', 'drop-off', 'horizontal']
+POINT_TYPES = ['survey', 'interpolated']
+COLUMNS = ['md', 'inc', 'azi', 'north', 'east', 'tvd', 'dl', 'dls']
+SURVEY_COLUMNS = COLUMNS[:-1]
+DELTA_KEYS = ['md', 'tvd', 'inc', 'azi', 'dl', 'dls', 'north', 'east']
+
+
+def column_property(name, doc):
+    def getter(self):
+        view = self._values(name)[:self.npoints]
+        view.flags.writeable = False
+        return view
+    return property(getter, doc=doc)
 
 
 class Well(object):
+    """
+    Wellbore trajectory stored as contiguous columns (one float64 array per property and int8 codes for
+    sectionType and pointType). Only the survey columns are calculated when the well is created, dls and the deltas
+    between points are calculated on first access. In compact mode (see Well.compact) the columns except md are
+    stored as float32, with north and east relative to a float64 origin.
+
+    data: {'info': dict, 'columns': dict of arrays} or {'info': dict, 'trajectory': list of point dicts}. For a
+        compact well, also 'origin': {'north': num, 'east': num}, with north and east columns relative to it.
+    """
+    md = column_property('md', 'measured depth of every point, read-only array')
+    inc = column_property('inc', 'inclination of every point, read-only array')
+    azi = column_property('azi', 'azimuth of every point, read-only array')
+    north = column_property('north', 'north coordinate of every point, read-only array')
+    east = column_property('east', 'east coordinate of every point, read-only array')
+    tvd = column_property('tvd', 'true vertical depth of every point, read-only array')
+    dl = column_property('dl', 'dogleg with the previous point, read-only array')
+    dls = column_property('dls', 'dogleg severity with the previous point, read-only array')
+
     def __init__(self, data):
         self.info = data['info']
-        self.trajectory = data['trajectory']
-        for idx, point in enumerate(self.trajectory):
-            if idx > 0:
-                delta_md = point['md'] - self.trajectory[idx - 1]['md']
-                point['dls'] = calc_dls(point, delta_md, resolution=self.info['dlsResolution'])
-                point['delta'] = get_delta(point, self.trajectory[idx-1])
+        self._origin = data.get('origin')
+        if 'columns' in data:
+            self._set_columns(data['columns'])
+        else:
+            self._set_columns(points_to_columns(data['trajectory']))
+
+    def __getstate__(self):
+        """
+        Pickle only the info and the columns, the derived columns and trajectory are calculated again when needed
+        """
+        state = self.__dict__.copy()
+        state['_columns'] = {name: values[:self.npoints] for name, values in self._columns.items()}
+        state['_cache'] = {}
+        state['_trajectory'] = None
+        return state
+
+    def _set_columns(self, columns):
+        dtype = np.float64 if self._origin is None else np.float32
+        self._columns = {name: np.ascontiguousarray(columns[name], dtype=np.float64 if name == 'md' else dtype)
+                         for name in SURVEY_COLUMNS}
+        self._columns['sectionType'] = encode(columns['sectionType'], SECTION_TYPES)
+        self._columns['pointType'] = encode(columns['pointType'], POINT_TYPES)
+        self.npoints = len(self._columns['md'])
+        self._invalidate()
+
+    def _invalidate(self):
+        """
+        Drop everything derived from the columns, it is calculated again on next access
+        """
+        self._cache = {}
+        self._trajectory = None
+
+    def _values(self, name):
+        """
+        Get the array behind a survey or derived column. For a compact well, the survey columns are converted to
+        float64 absolute values.
+        """
+        if name in self._columns:
+            return self._column(name)
+        return self._derived(name)
+
+    def _column(self, name, idx=None):
+        """
+        Get values of a survey or derived column, as float64 absolute values also for a compact well
+        :param name: name of the column
+        :param idx: position or positions of the values, all the points by default
+        """
+        if idx is None:
+            idx = slice(self.npoints)
+        if name not in self._columns:
+            return self._derived(name)[idx]
+        values = self._columns[name][idx]
+        if self._origin is None:
+            return values
+        return values.astype(np.float64) + self._origin.get(name, 0.0)
+
+    @property
+    def is_compact(self):
+        """True if the columns are stored as float32, see Well.compact"""
+        return self._origin is not None
+
+    def compact(self):
+        """
+        Store the columns as float32 to use about 40% less memory, with north and east relative to the first point
+        (kept as float64). md stays as float64, so the depths of the points are exact and the point lookups by md
+        don't change. The columns are still returned as float64 absolute values, converted on every access.
+        float32 keeps 24 significant bits, so every value is stored with an error of at most 6e-8 times its
+        magnitude: 0.6 mm for tvd and for north/east within 10 km of the first point, 2e-5° for inclination and
+        azimuth, and 6e-8 times the dogleg for dl and dls.
+        :return: the well itself
+        """
+        if self._origin is None:
+            names = SURVEY_COLUMNS + ['sectionType', 'pointType']
+            columns = {name: self._columns[name][:self.npoints] for name in names}
+            self._origin = {name: float(columns[name][0]) if self.npoints else 0.0 for name in ['north', 'east']}
+            for name in self._origin:
+                columns[name] = columns[name] - self._origin[name]
+            self._set_columns(columns)
+        return self
+
+    def _derived(self, name):
+        """
+        Get a column derived from the survey columns ('dls', 'tvd_index' or 'delta_' + column name). It is
+        calculated on first access and kept until the columns change.
+        """
+        key = (name, self.info['dlsResolution']) if name in ['dls', 'delta_dls'] else name
+        if key not in self._cache:
+            if name == 'dls':
+                values = np.zeros(self.npoints)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values[1:] = self.dl[1:] * self.info['dlsResolution'] / np.diff(self.md)
+            elif name == 'tvd_index':
+                values = get_tvd_index(self.tvd)
+            elif name.startswith('delta_'):
+                column = getattr(self, name[len('delta_'):])
+                values = np.diff(column, prepend=column[:1])
             else:
-                point['dls'] = 0
-                point['delta'] = get_delta(point)
-        self.npoints = len(self.trajectory)
+                raise ValueError('The column "{}" is not recognised'.format(name))
+            self._cache[key] = values
+        return self._cache[key]
+
+    @property
+    def tvd_index(self):
+        """running maximum of the TVD, used to find the first point reaching certain TVD"""
+        return self._derived('tvd_index')[:self.npoints]
+
+    @property
+    def deltas(self):
+        """dict with the change of every property from the previous point, as read-only arrays"""
+        deltas = {}
+        for name in DELTA_KEYS:
+            deltas[name] = self._derived('delta_' + name)[:self.npoints]
+            deltas[name].flags.writeable = False
+        return deltas
+
+    @property
+    def section_type(self):
+        """sectionType of every point"""
+        return decode(self._columns['sectionType'][:self.npoints], SECTION_TYPES)
+
+    @property
+    def point_type(self):
+        """pointType of every point"""
+        return decode(self._columns['pointType'][:self.npoints], POINT_TYPES)
+
+    @property
+    def trajectory(self):
+        """
+        Trajectory as list of point dicts. It is built from the columns on first access and kept, changes made to
+        the dicts are not written back to the columns.
+        """
+        if self._trajectory is None:
+            values = [getattr(self, name).tolist() for name in COLUMNS]
+            values += [self.section_type.tolist(), self.point_type.tolist()]
+            deltas = [values.tolist() for values in self.deltas.values()]
+            self._trajectory = []
+            for row in zip(*values, *deltas):
+                point = dict(zip(COLUMNS + ['sectionType', 'pointType'], row[:10]))
+                point['delta'] = dict(zip(DELTA_KEYS, row[10:]))
+                self._trajectory.append(point)
+        return self._trajectory
+
+    @trajectory.setter
+    def trajectory(self, trajectory):
+        compact, self._origin = self.is_compact, None
+        self._set_columns(points_to_columns(trajectory))
+        if compact:
+            self.compact()
+
+    def _point(self, idx):
+        """
+        Get a single point as dict, same as self.trajectory[idx] but without building the whole trajectory
+        """
+        point = {name: self._column(name, idx).item() for name in COLUMNS}
+        point['sectionType'] = decode(self._columns['sectionType'][idx], SECTION_TYPES)
+        point['pointType'] = decode(self._columns['pointType'][idx], POINT_TYPES)
+        if idx > 0:
+            point['delta'] = {name: point[name] - self._column(name, idx - 1).item() for name in DELTA_KEYS}
+        else:
+            point['delta'] = dict.fromkeys(DELTA_KEYS, 0.0)
+        return point
+
+    def _md_at_tvd(self, tvd):
+        """
+        Get the MD where the trajectory reaches every TVD value for the first time
+        """
+        if np.any(tvd < 0):
+            raise ValueError('TVD value must be positive')
+        if np.any(tvd > self.tvd_index[-1]):
+            raise ValueError("TVD value can't be deeper than deepest trajectory TVD")
+
+        idx = np.searchsorted(self.tvd_index, tvd)
+        station = np.round(self.tvd[idx], 2) == np.round(tvd, 2)
+        md = self.md[idx].copy()
+
+        idx, target = idx[~station], tvd[~station]
+        p1 = {name: self._column(name, idx - 1) for name in SURVEY_COLUMNS}
+        p2 = {name: self._column(name, idx) for name in SURVEY_COLUMNS}
+        p2['sectionType'] = decode(self._columns['sectionType'][idx], SECTION_TYPES)
+        md[~station] = solve_md(target, p1, p2, self.info['dlsResolution'])
+
+        return md
 
     def plot(self, **kwargs):
-        default = {'plot_type': '3d', 'add_well': None, 'names': None, 'style': None, 'y_axis': 'md', 'x_axis': 'inc'}
+        default = {'plot_type': '3d', 'add_well': None, 'names': None, 'style': None, 'y_axis': 'md', 'x_axis': 'inc',
+                   'max_points': None, 'tolerance': None}
         for key, value in kwargs.items():
             default[key] = value
+        decimation = {'max_points': default['max_points'], 'tolerance': default['tolerance']}
 
         if default['plot_type'] == '3d':
-            fig = plot_wellpath(self, add_well=default['add_well'], names=default['names'], style=default['style'])
+            fig = plot_wellpath(self, add_well=default['add_well'], names=default['names'], style=default['style'],
+                                **decimation)
             return fig
         elif default['plot_type'] == 'top':
-            fig = plot_top_view(self, add_well=default['add_well'], names=default['names'], style=default['style'])
+            fig = plot_top_view(self, add_well=default['add_well'], names=default['names'], style=default['style'],
+                                **decimation)
             return fig
         elif default['plot_type'] == 'vs':
             fig = plot_vs(self, y_axis=default['y_axis'], x_axis=default['x_axis'], add_well=default['add_well'],
-                          names=default['names'], style=default['style'])
+                          names=default['names'], style=default['style'], **decimation)
             return fig
         else:
             raise ValueError('The plot type "{}" is not recognised'.format(default['plot_type']))
 
     def df(self):
-        dataframe = pd.DataFrame(self.trajectory)
-        return dataframe
+        """
+        Trajectory as dataframe, with the change from the previous point in delta_md, delta_tvd, delta_inc... columns
+        and sectionType and pointType as categoricals. It is built on the read-only columns of the well without
+        copying them and kept until the well changes, so the values must not be changed. A shallow copy is returned,
+        adding or removing columns doesn't change the kept dataframe.
+        """
+        key = ('df', self.info['dlsResolution'])
+        if key not in self._cache:
+            columns = {name: getattr(self, name) for name in COLUMNS}
+            columns['sectionType'] = pd.Categorical.from_codes(self._columns['sectionType'][:self.npoints],
+                                                               SECTION_TYPES)
+            columns['pointType'] = pd.Categorical.from_codes(self._columns['pointType'][:self.npoints], POINT_TYPES)
+            columns.update({'delta_' + name: values for name, values in self.deltas.items()})
+            self._cache[key] = pd.DataFrame(columns, copy=False)
+        return self._cache[key].copy(deep=False)
+
+    def save(self, path):
+        """
+        Save the trajectory columns and info in a binary file (uncompressed NPZ), that can be opened again with
+        well_profile.open_well without repeating the survey calculations. A compact well is saved and opened as compact.
+        :param path: file name, '.npz' is added if it doesn't end with it
+        """
+        columns = {name: self._columns[name][:self.npoints] for name in SURVEY_COLUMNS + ['sectionType', 'pointType']}
+        if self.is_compact:
+            columns['origin'] = np.array(json.dumps(self._origin, default=json_value))
+        np.savez(path, info=np.array(json.dumps(self.info, default=json_value)), **columns)
+
+    def add_survey(self, md, inc, azi):
+        """
+        Append a survey station after the last point, calculated from the last point with the minimum curvature
+        method. The columns keep spare capacity that is doubled when it runs out, and the derived columns already
+        calculated are only extended with the new station, so every station takes constant time.
+        :param md: measured depth, deeper than the last point
+        :param inc: inclination, °
+        :param azi: azimuth, °
+        :return: the new point as dict
+        """
+        idx = self.npoints
+        p1 = {name: self._column(name, idx - 1).item() for name in SURVEY_COLUMNS}
+        if not md > p1['md']:
+            raise ValueError('MD must be deeper than the last point')
+
+        dogleg = calc_dogleg(p1['inc'], inc, p1['azi'], azi)
+        p2 = {'md': md, 'inc': inc, 'azi': azi, 'dl': degrees(dogleg),
+              'north': calc_north(p1['north'], p1['md'], md, p1['inc'], inc, p1['azi'], azi, dogleg),
+              'east': calc_east(p1['east'], p1['md'], md, p1['inc'], inc, p1['azi'], azi, dogleg),
+              'tvd': calc_tvd(p1['tvd'], p1['md'], md, p1['inc'], inc, dogleg)}
+        section = define_section(p2, p1)
+        p2['sectionType'] = SECTION_TYPES.index(section) if section in SECTION_TYPES else -1
+        p2['pointType'] = POINT_TYPES.index('survey')
+
+        self._columns = grow_columns(self._columns, idx + 1, self._columns)
+        for name, value in p2.items():
+            self._columns[name][idx] = value - (self._origin or {}).get(name, 0.0)
+        self.npoints += 1
+        self._extend_cache()
+
+        if self._trajectory is not None:
+            self._trajectory.append(self._point(idx))
+        return self._point(idx)
+
+    def _extend_cache(self):
+        """
+        Calculate the derived columns already kept for the last point, the rest of the cache is dropped
+        """
+        idx = self.npoints - 1
+        resolution = self.info['dlsResolution']
+        kept = [key for key in self._cache if not isinstance(key, tuple) or (key[0] != 'df' and key[1] == resolution)]
+        kept.sort(key=lambda x: x != ('dls', resolution))      # dls first, delta_dls needs it
+        cache, self._cache = self._cache, {}
+
+        for key in kept:
+            name = key[0] if isinstance(key, tuple) else key
+            values = grow_array(cache[key], idx + 1)
+            if name == 'dls':
+                values[idx] = self._column('dl', idx) * resolution / (self._column('md', idx) -
+                                                                      self._column('md', idx - 1))
+            elif name == 'tvd_index':
+                values[idx] = max(values[idx - 1], self._column('tvd', idx))
+            else:
+                column = name[len('delta_'):]
+                values[idx] = self._column(column, idx) - self._column(column, idx - 1)
+            self._cache[key] = values
 
     def add_location(self, lat, lon):
         """
@@ -59,14 +351,67 @@ class Well(object):
         :return: point dictionary with all the data
         """
         if depth_type == 'md':
-            return interp_pt(depth, self.trajectory)
+            if depth < 0:
+                raise ValueError('MD value must be positive')
+            if depth > self.md[-1]:
+                raise ValueError("MD can't be deeper than deepest trajectory MD")
+
+            idx = int(np.searchsorted(self.md, depth))
+            if self.md[idx] == depth:
+                return self._point(idx)
+
+            return interp_segment(depth, self._point(idx - 1), self._point(idx), self.info['dlsResolution'])
 
         elif depth_type == 'tvd':
-            return scan_tvd(depth, self.trajectory)
+            if depth < 0:
+                raise ValueError('TVD value must be positive')
+            if depth > self.tvd_index[-1]:
+                raise ValueError("TVD value can't be deeper than deepest trajectory TVD")
+
+            idx = int(np.searchsorted(self.tvd_index, depth))
+            if round(self.tvd[idx], 2) == round(depth, 2):
+                return self._point(idx)
+
+            return interp_segment_tvd(depth, self._point(idx - 1), self._point(idx), self.info['dlsResolution'])
 
         else:
             raise ValueError(depth_type, ' is not a valid value for depth_type')
 
+    def get_points(self, depths, depth_type='md'):
+        """
+        Get all the trajectory information at many depths at once
+        :param depths: list or array of depth values, MD or TVD
+        :param depth_type: 'md' (by default) or 'tvd'
+        :return: dict of arrays md, inc, azi, north, east, tvd, dl, dls, sectionType and pointType
+        """
+        depths = np.atleast_1d(np.asarray(depths, dtype=float))
+
+        if depth_type == 'tvd':
+            depths = self._md_at_tvd(depths)
+
+        elif depth_type != 'md':
+            raise ValueError(depth_type, ' is not a valid value for depth_type')
+
+        if np.any(depths < 0):
+            raise ValueError('MD value must be positive')
+        if np.any(depths > self.md[-1]):
+            raise ValueError("MD can't be deeper than deepest trajectory MD")
+
+        idx = np.searchsorted(self.md, depths)
+        exact = self.md[idx] == depths
+        idx1 = np.maximum(idx - 1, 0)
+        p1 = {name: self._column(name, idx1) for name in SURVEY_COLUMNS}
+        p2 = {name: self._column(name, idx) for name in COLUMNS}
+        p2['sectionType'] = decode(self._columns['sectionType'][idx], SECTION_TYPES)
+
+        points = interp_arrays(depths, p1, p2, self.info['dlsResolution'])
+        for name in COLUMNS:
+            points[name] = np.where(exact, p2[name], points[name])
+        points['pointType'] = np.where(exact, decode(self._columns['pointType'][idx], POINT_TYPES), 'interpolated')
+        points['pointType'] = points['pointType'].astype(object)
+
+        return points
+
 
 def define_section(p2, p1=None):
 
@@ -100,3 +445,96 @@ def get_delta(p2, p1=None):
             delta_dict.update({param: p2[param] - p1[param]})
 
     return delta_dict
+
+
+def define_sections(inc, tvd):
+    """
+    Vectorized version of define_section along a whole trajectory
+    :param inc: inclination of every point
+    :param tvd: tvd of every point
+    :return: array with sectionType codes, as positions in SECTION_TYPES
+    """
+    inc, tvd = np.asarray(inc, dtype=float), np.asarray(tvd, dtype=float)
+    codes = np.zeros(len(inc), dtype=np.int8)
+    inc1, inc2 = inc[:-1], inc[1:]
+    same_inc = np.round(inc1, 2) == np.round(inc2, 2)
+    codes[1:] = np.select([(inc1 == 0) & (inc2 == 0),
+                           same_inc & (tvd[:-1] == 0) & (tvd[1:] == 0),
+                           same_inc,
+                           inc2 > inc1,
+                           inc2 < inc1],
+                          [SECTION_TYPES.index(x) for x in ['vertical', 'horizontal', 'hold', 'build-up',
+                                                            'drop-off']],
+                          -1)
+    return codes
+
+
+def encode(values, categories):
+    """
+    Get the int8 codes (positions in categories) for a sequence of values. Unknown values get -1.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int8, copy=False)
+    positions = {category: code for code, category in enumerate(categories)}
+    return np.array([positions.get(x, -1) for x in values.tolist()], dtype=np.int8)
+
+
+def decode(codes, categories):
+    """
+    Get the values related to a sequence of int8 codes, code -1 is returned as None.
+    """
+    return np.array(categories + [None], dtype=object)[codes]
+
+
+def json_value(value):
+    """
+    Convert numpy scalars and arrays to python types for json.dumps
+    """
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(value).__name__))
+
+
+def grow_columns(template, size, columns=None):
+    """
+    Get columns with capacity for at least size points. The capacity is doubled every time it is not enough, so
+    appending points one chunk at a time takes amortized constant time per point.
+    :param template: dict of arrays, used for the column names and dtypes when columns is None
+    :param size: number of points to fit
+    :param columns: current columns, returned as they are if they are long enough
+    :return: dict of arrays, with the values of the current columns at the start
+    """
+    if columns is None:
+        return {name: np.empty(size, dtype=np.asarray(values).dtype) for name, values in template.items()}
+
+    capacity = len(columns['md'])
+    if size <= capacity:
+        return columns
+
+    capacity = max(size, 2 * capacity)
+    new_columns = {}
+    for name, values in columns.items():
+        new_columns[name] = np.empty(capacity, dtype=values.dtype)
+        new_columns[name][:len(values)] = values
+    return new_columns
+
+
+def grow_array(values, size):
+    """
+    Get an array with capacity for at least size values, doubling the capacity when it is not enough
+    """
+    if size <= len(values):
+        return values
+    new_values = np.empty(max(size, 2 * len(values)), dtype=values.dtype)
+    new_values[:len(values)] = values
+    return new_values
+
+
+def points_to_columns(trajectory):
+    """
+    Convert a trajectory given as list of point dicts to a dict of columns
+    """
+    columns = {name: [point[name] for point in trajectory] for name in SURVEY_COLUMNS + ['sectionType']}
+    columns['pointType'] = [point.get('pointType', 'survey') for point in trajectory]
+    return columns